@@ -6,6 +6,8 @@ Matches exact existing design: Cormorant Garamond, Crimson Pro, terracotta/cream
 """
 
 from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import os
 
 FONTS_DIR = os.path.join(os.path.dirname(__file__), 'fonts')
@@ -23,8 +25,9 @@ DIVIDER_GOLD = (200, 180, 140)   # muted gold for dividers
 DARK_STRIP = (50, 35, 30)        # top/bottom dark strips
 
 
+@functools.lru_cache(maxsize=None)
 def make_font(path, size, weight=None):
-    """Create a font with optional variable weight."""
+    """Create a font with optional variable weight (cached per path, size and weight)."""
     font = ImageFont.truetype(path, size)
     if weight is not None:
         font.set_variation_by_axes([weight])
@@ -144,14 +147,16 @@ def generate_post2_three_features():
 
     path = os.path.join(os.path.dirname(__file__), 'instagram-posts', 'post-2-three-features.png')
     img.save(path, 'PNG')
-    logging.info(f\'  ✅ Saved {path}')
+    logging.info(f'  ✅ Saved {path}')
     return path
 
 
-def generate_story_features():
+@functools.lru_cache(maxsize=1)
+def render_vertical_features_card():
     """
-    Story: Features overview — 1080x1920 (9:16 stories format)
-    Changes "18 local vendors" → "Local vendors"
+    Features card — 1080x1920 (9:16), shared by the Instagram story and the
+    WhatsApp vertical card, which use the identical layout. Rendered once per
+    run; callers save it as is (copy() it before drawing on it).
     """
     W, H = 1080, 1920
     img = Image.new('RGB', (W, H), CREAM_BG)
@@ -171,7 +176,7 @@ def generate_story_features():
     draw.text(((W - tw) // 2, 220), title, fill=DARK_BROWN, font=title_font)
 
     # Hebrew: נשמה (use system font with Hebrew support)
-    hebrew_font = ImageFont.truetype(HEBREW_FONT, 24)
+    hebrew_font = make_font(HEBREW_FONT, 24)
     hebrew = "נ ש מ ה"
     bbox = draw.textbbox((0, 0), hebrew, font=hebrew_font)
     hw = bbox[2] - bbox[0]
@@ -250,9 +255,19 @@ def generate_story_features():
     # Bottom dark strip
     draw.rectangle([0, H - 5, W, H], fill=DARK_STRIP)
 
+    return img
+
+
+def generate_story_features():
+    """
+    Story: Features overview — 1080x1920 (9:16 stories format)
+    Changes "18 local vendors" → "Local vendors"
+    """
+    img = render_vertical_features_card()
+
     path = os.path.join(os.path.dirname(__file__), 'marketing-kit', 'instagram-stories', 'story-features.png')
     img.save(path, 'PNG')
-    logging.info(f\'  ✅ Saved {path}')
+    logging.info(f'  ✅ Saved {path}')
     return path
 
 
@@ -261,108 +276,27 @@ def generate_whatsapp_vertical():
     WhatsApp vertical card — 1080x1920 (same as story format)
     Changes "18 local vendors" → "Local vendors"
     """
-    W, H = 1080, 1920
-    img = Image.new('RGB', (W, H), CREAM_BG)
-    draw = ImageDraw.Draw(img)
-
-    # Top dark strip
-    draw.rectangle([0, 0, W, 18], fill=DARK_STRIP)
-
-    # Candle
-    draw_candle(draw, W // 2, 130)
-
-    # NESHAMA title
-    title_font = make_font(CG_FONT, 72, weight=300)
-    title = "NESHAMA"
-    bbox = draw.textbbox((0, 0), title, font=title_font)
-    tw = bbox[2] - bbox[0]
-    draw.text(((W - tw) // 2, 220), title, fill=DARK_BROWN, font=title_font)
-
-    # Hebrew: נשמה (use system font with Hebrew support)
-    hebrew_font = ImageFont.truetype(HEBREW_FONT, 24)
-    hebrew = "נ ש מ ה"
-    bbox = draw.textbbox((0, 0), hebrew, font=hebrew_font)
-    hw = bbox[2] - bbox[0]
-    draw.text(((W - hw) // 2, 310), hebrew, fill=MUTED_BROWN, font=hebrew_font)
-
-    # Divider
-    draw_divider(draw, 345, W)
-
-    # Tagline
-    tagline_font = make_font(CG_FONT, 38, weight=400)
-    tagline = "Every Soul Remembered"
-    bbox = draw.textbbox((0, 0), tagline, font=tagline_font)
-    tw = bbox[2] - bbox[0]
-    draw.text(((W - tw) // 2, 365), tagline, fill=TERRACOTTA, font=tagline_font)
-
-    # Three features — SAME as story-features but without "18"
-    features = [
-        ("Obituary Feed", ["Steeles, Benjamin's & Paperman's", "all in one place"]),
-        ("Meal Coordination", ["Sign up to bring food on specific days", "no more duplicate kugels"]),
-        ("Caterer Directory", ["Local vendors who do", "shiva meals"]),
-    ]
-
-    feat_title_font = make_font(CG_FONT, 30, weight=700)
-    feat_body_font = make_font(CP_FONT, 22, weight=400)
-    y = 460
-
-    for title, lines in features:
-        draw_divider(draw, y, W)
-        y += 20
-        bbox = draw.textbbox((0, 0), title, font=feat_title_font)
-        tw = bbox[2] - bbox[0]
-        draw.text(((W - tw) // 2, y), title, fill=DARK_BROWN, font=feat_title_font)
-        y += 45
-        for line in lines:
-            bbox = draw.textbbox((0, 0), line, font=feat_body_font)
-            lw = bbox[2] - bbox[0]
-            draw.text(((W - lw) // 2, y), line, fill=SAGE, font=feat_body_font)
-            y += 30
-        y += 30
-
-    # "Completely free. No sign-up. No ads."
-    draw_divider(draw, y, W)
-    y += 20
-    free_font = make_font(CP_FONT, 22, weight=400)
-    free_text = "Completely free. No sign-up. No ads."
-    bbox = draw.textbbox((0, 0), free_text, font=free_font)
-    fw = bbox[2] - bbox[0]
-    draw.text(((W - fw) // 2, y), free_text, fill=MUTED_BROWN, font=free_font)
-
-    # CTA Button
-    y += 60
-    btn_w, btn_h = 300, 55
-    btn_x = (W - btn_w) // 2
-    draw.rounded_rectangle([btn_x, y, btn_x + btn_w, y + btn_h], radius=28, fill=TERRACOTTA)
-    btn_font = make_font(CP_FONT, 22, weight=600)
-    btn_text = "Visit neshama.ca"
-    bbox = draw.textbbox((0, 0), btn_text, font=btn_font)
-    btw = bbox[2] - bbox[0]
-    bth = bbox[3] - bbox[1]
-    draw.text((btn_x + (btn_w - btw) // 2, y + (btn_h - bth) // 2 - 2), btn_text, fill='white', font=btn_font)
-
-    # Bottom footer
-    footer_font = make_font(CP_FONT, 18, weight=400)
-    footer = "A free resource for Toronto & Montreal's Jewish community"
-    bbox = draw.textbbox((0, 0), footer, font=footer_font)
-    fw = bbox[2] - bbox[0]
-    draw.text(((W - fw) // 2, H - 100), footer, fill=SAGE, font=footer_font)
-
-    # Bottom dark strip
-    draw.rectangle([0, H - 5, W, H], fill=DARK_STRIP)
+    img = render_vertical_features_card()
 
     path = os.path.join(os.path.dirname(__file__), 'marketing-kit', 'whatsapp', 'whatsapp-vertical-card.png')
     img.save(path, 'PNG')
-    logging.info(f\'  ✅ Saved {path}')
+    logging.info(f'  ✅ Saved {path}')
     return path
 
 
 if __name__ == '__main__':
-    logging.info(\'\n🎨 Regenerating Neshama marketing graphics...\n')
-    logging.info(\'Removing "18" vendor count from all assets:\n')
-
-    generate_post2_three_features()
-    generate_story_features()
-    generate_whatsapp_vertical()
-
-    logging.info(\'\n✅ All 3 graphics regenerated!\n')
+    logging.info('\n🎨 Regenerating Neshama marketing graphics...\n')
+    logging.info('Removing "18" vendor count from all assets:\n')
+
+    # The generators write separate files and most of their time is PNG
+    # encoding, which Pillow runs with the GIL released, so they run on
+    # threads. The shared vertical card is rendered first so the story and
+    # WhatsApp generators don't both draw it.
+    render_vertical_features_card()
+    generators = [generate_post2_three_features, generate_story_features, generate_whatsapp_vertical]
+    with ThreadPoolExecutor(max_workers=len(generators)) as executor:
+        futures = [executor.submit(generate) for generate in generators]
+        for future in futures:
+            future.result()
+
+    logging.info('\n✅ All 3 graphics regenerated!\n')
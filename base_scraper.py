@@ -12,12 +12,39 @@ import time
 import re
 import requests
 from abc import ABC, abstractmethod
+from urllib3.util import Retry
 from datetime import datetime
 from database_setup import NeshamaDatabase
 from city_config import get_city_by_slug
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP retry policy for every scraper session. Only transient failures
+# are retried — connection errors, timeouts, throttling and gateway/server
+# hiccups — with exponential backoff, honouring Retry-After on 429/503.
+# Permanent errors (404 etc.) fail on the first attempt. Retry objects are
+# immutable (each retry derives a new one), so one instance is safe to share
+# across sessions and threads.
+HTTP_RETRY = Retry(
+    total=2,  # 3 attempts in all
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({'GET', 'HEAD'}),
+    backoff_factor=1.0,
+    respect_retry_after_header=True,
+    raise_on_status=False,  # hand back the last response so raise_for_status reports it
+)
+
+
+def mount_http_retries(session):
+    """Set HTTP_RETRY on every adapter already mounted on a session; returns the session.
+
+    The existing adapters are kept rather than replaced, so a cloudscraper
+    session keeps its CipherSuiteAdapter (TLS ciphers and fingerprint).
+    """
+    for adapter in session.adapters.values():
+        adapter.max_retries = HTTP_RETRY
+    return session
+
 
 class BaseScraper(ABC):
     """
@@ -28,7 +55,7 @@ class BaseScraper(ABC):
         - parse_obituary(raw_data) -> dict matching the obituary schema
 
     The base class provides:
-        - HTTP session with retry logic and rate limiting
+        - HTTP session with the shared HTTP_RETRY policy and rate limiting
         - Database integration (upsert_obituary, log_scraper_run)
         - City metadata from city_config
         - Standardized run() loop with error handling and stats
@@ -54,7 +81,7 @@ class BaseScraper(ABC):
         self.region = self.city_config.get('region', '')
 
         # HTTP session
-        self.session = requests.Session()
+        self.session = mount_http_retries(requests.Session())
         self.session.headers.update({
             'User-Agent': (
                 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
@@ -82,50 +109,36 @@ class BaseScraper(ABC):
             time.sleep(self.request_delay - elapsed)
         self._last_request_time = time.time()
 
-    def fetch_page(self, url, retries=3, timeout=15):
+    def fetch_page(self, url, timeout=15):
         """
-        Fetch a page with retry logic and rate limiting.
+        Fetch a page with rate limiting; transient failures are retried by
+        the session (HTTP_RETRY).
         Returns the response text, or None on failure.
         """
         self._rate_limit()
 
-        for attempt in range(retries):
-            try:
-                response = self.session.get(url, timeout=timeout)
-                response.raise_for_status()
-                return response.text
-            except requests.exceptions.RequestException as e:
-                logger.warning(
-                    f"[{self.source_name}] Request failed (attempt {attempt + 1}/{retries}): "
-                    f"{url} — {e}"
-                )
-                if attempt < retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff: 1s, 2s, 4s
-                else:
-                    logger.error(f"[{self.source_name}] All retries exhausted for {url}")
+        try:
+            response = self.session.get(url, timeout=timeout)
+            response.raise_for_status()
+            return response.text
+        except requests.exceptions.RequestException as e:
+            logger.error(f"[{self.source_name}] Request failed: {url} — {e}")
         return None
 
-    def fetch_json(self, url, retries=3, timeout=15):
+    def fetch_json(self, url, timeout=15):
         """
-        Fetch a JSON endpoint with retry logic and rate limiting.
+        Fetch a JSON endpoint with rate limiting; transient failures are
+        retried by the session (HTTP_RETRY).
         Returns parsed JSON (dict/list), or None on failure.
         """
         self._rate_limit()
 
-        for attempt in range(retries):
-            try:
-                response = self.session.get(url, timeout=timeout)
-                response.raise_for_status()
-                return response.json()
-            except (requests.exceptions.RequestException, ValueError) as e:
-                logger.warning(
-                    f"[{self.source_name}] JSON fetch failed (attempt {attempt + 1}/{retries}): "
-                    f"{url} — {e}"
-                )
-                if attempt < retries - 1:
-                    time.sleep(2 ** attempt)
-                else:
-                    logger.error(f"[{self.source_name}] All retries exhausted for {url}")
+        try:
+            response = self.session.get(url, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"[{self.source_name}] JSON fetch failed: {url} — {e}")
         return None
 
     # ──────────────────────────────────────────────
@@ -9,6 +9,7 @@ import sqlite3
 import hashlib
 from datetime import datetime
 import os
+from urllib.parse import quote
 
 class NeshamaDatabase:
     def __init__(self, db_path=None):
@@ -21,8 +22,33 @@ class NeshamaDatabase:
         """Establish database connection with busy timeout"""
         self.conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
         self.conn.execute('PRAGMA busy_timeout=30000')
+        # Per-connection settings; the API server puts the file in WAL at startup.
+        # Under WAL, NORMAL skips the fsync on every upsert's commit and only
+        # syncs at checkpoints, so a scraper run no longer pays one per row.
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
         self.cursor = self.conn.cursor()
 
+    def connect_readonly(self):
+        """Open a read-only connection (for status/report queries).
+        mode=ro plus query_only means it can never take the write lock, so under
+        WAL it reads alongside a running scraper without blocking it or
+        being blocked. Falls back to a normal connection if the file can't be
+        opened read-only (e.g. a WAL database whose -shm file can't be created)."""
+        uri = f"file:{quote(os.path.abspath(self.db_path))}?mode=ro"
+        try:
+            conn = sqlite3.connect(uri, uri=True, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA busy_timeout=30000')
+            # SQLite opens lazily; reading the schema cookie surfaces any
+            # read-only open failure here rather than at the first real query
+            conn.execute('PRAGMA schema_version')
+        except sqlite3.OperationalError:
+            self.connect()
+        else:
+            self.conn = conn
+            self.cursor = conn.cursor()
+        self.conn.execute('PRAGMA query_only=1')
+
     def close(self):
         """Close database connection"""
         if self.conn:
@@ -107,6 +133,12 @@ class NeshamaDatabase:
             ON obituaries(last_updated DESC)
         ''')
 
+        # The weekly digest's 7-day window filters and sorts on this expression
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_obituary_first_seen_or_updated
+            ON obituaries(COALESCE(first_seen, last_updated))
+        ''')
+
         self.cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_obituary_source
             ON obituaries(source)
@@ -142,6 +174,13 @@ class NeshamaDatabase:
             )
         ''')
 
+        # Latest-runs queries (ORDER BY run_time DESC LIMIT n) walk this backwards
+        # instead of sorting the whole log. Same definition the API server adds.
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_scraper_log_run_time
+            ON scraper_log(run_time)
+        ''')
+
         # Tributes table - condolence messages left by visitors
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS tributes (
@@ -223,7 +262,42 @@ class NeshamaDatabase:
     def upsert_obituary(self, obituary_data):
         """Insert new obituary or update existing one"""
         self.connect()
+        obit_id, action = self._upsert_obituary_row(obituary_data)
+        self.conn.commit()
+        self.close()
+        return obit_id, action
+
+    def upsert_obituaries(self, obituaries):
+        """upsert_obituary() for many obituaries over one connection and in one
+        transaction. Returns a list of (obit_id, action) in input order.
+        Each row runs under its own SAVEPOINT, so a row that raises is rolled
+        back alone and reported as (None, 'error'); the rest are still saved."""
+        obituaries = list(obituaries)
+        if not obituaries:
+            return []
+        self.connect()
+        self.conn.execute('BEGIN IMMEDIATE')
+        results = []
+        try:
+            for obituary_data in obituaries:
+                self.conn.execute('SAVEPOINT obituary_row')
+                try:
+                    results.append(self._upsert_obituary_row(obituary_data))
+                except Exception as e:
+                    self.conn.execute('ROLLBACK TO obituary_row')
+                    logging.error(f"Failed to save obituary {obituary_data.get('deceased_name', '?')}: {e}")
+                    results.append((None, 'error'))
+                self.conn.execute('RELEASE obituary_row')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            self.conn.close()
+            raise
+        self.conn.execute('COMMIT')
+        self.close()
+        return results
 
+    def _upsert_obituary_row(self, obituary_data):
+        """Upsert one obituary on the open connection; returns (obit_id, action)"""
         # Generate IDs and hashes
         obit_id = self.generate_obituary_id(
             obituary_data['source'],
@@ -341,14 +415,38 @@ class NeshamaDatabase:
             ))
             action = 'inserted'
 
-        self.conn.commit()
-        self.close()
         return obit_id, action
 
     def upsert_comment(self, obituary_id, comment_data):
         """Insert comment if it doesn't already exist"""
         self.connect()
+        comment_id = self._insert_comment_row(obituary_id, comment_data)
+        self.conn.commit()
+        self.close()
+        return comment_id
+
+    def upsert_comments(self, obituary_id, comments):
+        """upsert_comment() for all of an obituary's comments over one connection
+        and in one transaction. Returns how many were new."""
+        comments = list(comments)
+        if not comments:
+            return 0
+        self.connect()
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            new_count = sum(1 for comment_data in comments
+                            if self._insert_comment_row(obituary_id, comment_data))
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            self.conn.close()
+            raise
+        self.conn.execute('COMMIT')
+        self.close()
+        return new_count
 
+    def _insert_comment_row(self, obituary_id, comment_data):
+        """Insert one comment on the open connection unless it is a duplicate;
+        returns the new row id, or None for a duplicate"""
         # Check for duplicate
         self.cursor.execute('''
             SELECT id FROM comments
@@ -364,7 +462,6 @@ class NeshamaDatabase:
         ))
 
         if self.cursor.fetchone():
-            self.close()
             return None  # Duplicate, skip
 
         # Insert new comment
@@ -382,10 +479,7 @@ class NeshamaDatabase:
             now
         ))
 
-        comment_id = self.cursor.lastrowid
-        self.conn.commit()
-        self.close()
-        return comment_id
+        return self.cursor.lastrowid
 
     def log_scraper_run(self, source, status, stats=None, error=None, duration=None):
         """Log scraper execution for monitoring"""
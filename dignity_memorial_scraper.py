@@ -34,7 +34,7 @@ import time
 from datetime import datetime
 from bs4 import BeautifulSoup
 
-from base_scraper import BaseScraper
+from base_scraper import BaseScraper, mount_http_retries
 from city_config import CITIES
 
 logger = logging.getLogger(__name__)
@@ -91,9 +91,9 @@ class DignityMemorialScraper(BaseScraper):
 
         # Upgrade session for Cloudflare if possible
         if HAS_CLOUDSCRAPER:
-            self.session = cloudscraper.create_scraper(
+            self.session = mount_http_retries(cloudscraper.create_scraper(
                 browser={'browser': 'chrome', 'platform': 'darwin', 'mobile': False}
-            )
+            ))
             logger.info(f"[{self.source_name}] Using cloudscraper for Cloudflare bypass")
         else:
             # Add extra headers to look more like a real browser
@@ -14,6 +14,7 @@ import re
 import sys
 import subprocess
 import threading
+import contextlib
 from urllib.parse import urlparse, parse_qs, unquote, quote
 import urllib.request
 from datetime import datetime, timedelta, timezone as _tz
@@ -2675,19 +2676,23 @@ class NeshamaAPIHandler(BaseHTTPRequestHandler):
         try:
             db_path = self.get_db_path()
 
-            # Step 1: Remove lock files
-            for suffix in ['-wal', '-shm']:
-                lock_file = db_path + suffix
-                if os.path.exists(lock_file):
-                    os.remove(lock_file)
-                    steps.append(f'Removed {suffix}')
-                else:
-                    steps.append(f'No {suffix} file')
+            # The yahrzeit manager keeps one connection open for the process;
+            # close it and hold its requests off while the files are swapped
+            yahrzeit_closed = yahrzeit_mgr.connection_closed() if yahrzeit_mgr else contextlib.nullcontext()
+            with yahrzeit_closed:
+                # Step 1: Remove lock files
+                for suffix in ['-wal', '-shm']:
+                    lock_file = db_path + suffix
+                    if os.path.exists(lock_file):
+                        os.remove(lock_file)
+                        steps.append(f'Removed {suffix}')
+                    else:
+                        steps.append(f'No {suffix} file')
 
-            # Step 2: Open fresh in DELETE mode
-            conn = sqlite3.connect(db_path, timeout=5)
-            mode = conn.execute('PRAGMA journal_mode=DELETE').fetchone()[0]
-            steps.append(f'Switched to {mode}')
+                # Step 2: Open fresh in DELETE mode
+                conn = sqlite3.connect(db_path, timeout=5)
+                mode = conn.execute('PRAGMA journal_mode=DELETE').fetchone()[0]
+                steps.append(f'Switched to {mode}')
 
             # Step 3: Write test
             conn.execute('PRAGMA busy_timeout=5000')
@@ -5067,8 +5072,8 @@ button:hover{background:#c45a1a}</style></head>
             result = yahrzeit_mgr.subscribe(data)
 
             if result['status'] == 'success':
-                # Send confirmation email
-                yahrzeit_mgr.send_confirmation_email(result)
+                # Send confirmation email (in the background; SendGrid is slow)
+                yahrzeit_mgr.queue_confirmation_email(result)
                 # Trigger backup
                 if SHIVA_AVAILABLE:
                     shiva_mgr._trigger_backup()
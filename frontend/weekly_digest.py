@@ -7,29 +7,44 @@ Run via cron: 0 9 * * 0 /path/to/weekly_digest.py  (every Sunday 9 AM)
 
 import sqlite3
 from datetime import datetime, timedelta
-from collections import defaultdict
+from itertools import groupby
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
-import re as _re
+import re
+from html import unescape
+from string import Template
 from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Email, To, Content, MimeType
+from sendgrid.helpers.mail import Mail, Email, To, Content, MimeType, Header, Personalization, Substitution
 from subscription_manager import EmailSubscriptionManager
 import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 
 
+_RE_BR = re.compile(r'<br\s*/?>')
+_RE_P_CLOSE = re.compile(r'</p>')
+_RE_TR = re.compile(r'</tr>')
+_RE_TD = re.compile(r'</td>')
+_RE_A = re.compile(r'<a[^>]+href="([^"]+)"[^>]*>([^<]+)</a>')
+_RE_TAG = re.compile(r'<[^>]+>')
+_RE_NL = re.compile(r'\n{3,}')
+
+
 def _html_to_plain(html):
     """Convert HTML email to readable plain text"""
     text = html
-    text = _re.sub(r'<br\s*/?>','\n', text)
-    text = _re.sub(r'</p>', '\n\n', text)
-    text = _re.sub(r'</tr>', '\n', text)
-    text = _re.sub(r'</td>', ' ', text)
-    text = _re.sub(r'<a[^>]+href="([^"]+)"[^>]*>([^<]+)</a>', r'\2 (\1)', text)
-    text = _re.sub(r'<[^>]+>', '', text)
-    text = _re.sub(r'&middot;', '-', text)
-    text = _re.sub(r'&mdash;|&ndash;', '-', text)
-    text = _re.sub(r'&[a-z]+;', '', text)
-    text = _re.sub(r'\n{3,}', '\n\n', text)
+    # Skip whole families of passes when their trigger character is absent
+    if '<' in text:
+        text = _RE_BR.sub('\n', text)
+        text = _RE_P_CLOSE.sub('\n\n', text)
+        text = _RE_TR.sub('\n', text)
+        text = _RE_TD.sub(' ', text)
+        text = _RE_A.sub(r'\2 (\1)', text)
+        text = _RE_TAG.sub('', text)
+    if '&' in text:
+        # Decodes every named/numeric entity (&amp; in names, &#39;, ...) in one pass
+        text = unescape(text)
+    if '\n\n\n' in text:
+        text = _RE_NL.sub('\n\n', text)
     return text.strip()
 
 # Map location values to funeral home source names
@@ -38,109 +53,75 @@ LOCATION_SOURCES = {
     'montreal': ["Paperman & Sons"],
 }
 
+_FONT_SERIF = "Georgia, 'Times New Roman', serif"
+# "z\"l" (of blessed memory), appended to names that have a Hebrew name
+_ZL_SUFFIX = ' \u05d6\u05f4\u05dc'
+
+
+def _row_value(row, key):
+    """Column value from a sqlite3.Row (or dict), None if the column is absent"""
+    try:
+        return row[key]
+    except (IndexError, KeyError):
+        return None
+
+
+# SendGrid accepts up to 1000 personalizations per request
+SENDGRID_BATCH_SIZE = 1000
+# Per-recipient substitution token for the unsubscribe link in batched sends
+UNSUBSCRIBE_SUBSTITUTION = '-unsubscribe_url-'
+
+# Fixed SQL text per location so nothing is rebuilt per call and sqlite3's
+# statement cache can reuse the prepared query.
+_WEEKLY_SQL_ALL = '''
+    SELECT * FROM obituaries
+    WHERE COALESCE(first_seen, last_updated) >= ?
+    AND COALESCE(hidden, 0) = 0
+    ORDER BY COALESCE(first_seen, last_updated) DESC
+'''
+_WEEKLY_SQL_BY_LOCATION = {
+    loc: f'''
+    SELECT * FROM obituaries
+    WHERE COALESCE(first_seen, last_updated) >= ?
+    AND source IN ({','.join('?' * len(srcs))})
+    AND COALESCE(hidden, 0) = 0
+    ORDER BY COALESCE(first_seen, last_updated) DESC
+'''
+    for loc, srcs in LOCATION_SOURCES.items()
+}
 
-class WeeklyDigestSender:
-    def __init__(self, db_path='neshama.db', sendgrid_api_key=None):
-        """Initialize weekly digest sender"""
-        self.db_path = db_path
-        self.sendgrid_api_key = sendgrid_api_key or os.environ.get('SENDGRID_API_KEY')
-        self.from_email = 'updates@neshama.ca'
-        self.from_name = 'Neshama'
-        self.subscription_manager = EmailSubscriptionManager(db_path, sendgrid_api_key)
-
-    def get_weekly_obituaries(self, location=None):
-        """Get obituaries first seen in the last 7 days, optionally filtered by location.
-        Uses first_seen (not last_updated) so name corrections don't cause repeats."""
-        conn = sqlite3.connect(self.db_path, timeout=30)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cutoff_time = (datetime.now() - timedelta(days=7)).isoformat()
+# The locations column only ever holds a few values; map them straight to a
+# canonical (sorted) tuple and only fall back to parsing for anything else.
+_LOC_NORM = {
+    '': ('montreal', 'toronto'),
+    'toronto': ('toronto',),
+    'montreal': ('montreal',),
+    'toronto,montreal': ('montreal', 'toronto'),
+    'montreal,toronto': ('montreal', 'toronto'),
+}
 
-        if location and location in LOCATION_SOURCES:
-            sources = LOCATION_SOURCES[location]
-            placeholders = ','.join('?' for _ in sources)
-            cursor.execute(f'''
-                SELECT * FROM obituaries
-                WHERE COALESCE(first_seen, last_updated) >= ?
-                AND source IN ({placeholders})
-                AND COALESCE(hidden, 0) = 0
-                ORDER BY COALESCE(first_seen, last_updated) DESC
-            ''', [cutoff_time] + sources)
-        else:
-            cursor.execute('''
-                SELECT * FROM obituaries
-                WHERE COALESCE(first_seen, last_updated) >= ?
-                AND COALESCE(hidden, 0) = 0
-                ORDER BY COALESCE(first_seen, last_updated) DESC
-            ''', (cutoff_time,))
 
-        obituaries = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+def _normalize_locations(locations):
+    """Canonical location tuple for a subscriber's locations string"""
+    loc_key = (locations or '').replace(' ', '').lower()
+    loc_tuple = _LOC_NORM.get(loc_key)
+    if loc_tuple is None:
+        loc_tuple = tuple(sorted({l for l in loc_key.split(',') if l}))
+    return loc_tuple
 
-        return obituaries
 
-    def generate_weekly_html(self, obituaries):
-        """Generate HTML email content for weekly digest, grouped by day"""
-        if not obituaries:
-            return None
+# Reverse map so one 7-day query can be partitioned by location in Python
+SOURCE_TO_LOCATION = {src: loc for loc, srcs in LOCATION_SOURCES.items() for src in srcs}
 
-        count = len(obituaries)
-        now = datetime.now()
-        week_start = (now - timedelta(days=7)).strftime('%B %d')
-        week_end = now.strftime('%B %d, %Y')
 
-        # Group obituaries by day
-        by_day = defaultdict(list)
-        for obit in obituaries:
-            try:
-                updated = obit.get('first_seen') or obit.get('last_updated', '')
-                if updated:
-                    day_key = updated[:10]  # YYYY-MM-DD
-                    by_day[day_key].append(obit)
-            except Exception:
-                by_day['unknown'].append(obit)
-
-        # Sort days descending
-        sorted_days = sorted(by_day.keys(), reverse=True)
-
-        # Build day sections
-        day_sections = ''
-        for day_key in sorted_days:
-            day_obits = by_day[day_key]
-            try:
-                day_label = datetime.strptime(day_key, '%Y-%m-%d').strftime('%A, %B %d')
-            except ValueError:
-                day_label = day_key
+def _obit_day_key(obit):
+    """YYYY-MM-DD an obituary is listed under in the digest ('' if undated)"""
+    return (_row_value(obit, 'first_seen') or _row_value(obit, 'last_updated') or '')[:10]
 
-            obit_rows = ''
-            for obit in day_obits:
-                name = obit['deceased_name']
-                if obit.get('hebrew_name'):
-                    name += ' \u05d6\u05f4\u05dc'
 
-                details = ''
-                if obit.get('hebrew_name'):
-                    details += f'<p style="margin: 0 0 4px 0; font-size: 14px; color: #9e9488; direction: rtl; text-align: left;">{obit["hebrew_name"]}</p>'
-
-                source = obit.get('source', '')
-
-                obit_rows += f'''
-        <tr><td style="padding: 16px 0; border-bottom: 1px solid #f0ebe5;">
-            <p style="margin: 0 0 2px 0; font-family: Georgia, 'Times New Roman', serif; font-size: 17px; color: #3E2723;">{name}</p>
-            <p style="margin: 0 0 6px 0; font-family: Georgia, 'Times New Roman', serif; font-size: 12px; color: #9e9488;">{source}</p>
-            {details}
-            <p style="margin: 6px 0 0 0;"><a href="{obit['condolence_url']}" target="_blank" rel="noopener noreferrer" style="font-family: Georgia, 'Times New Roman', serif; font-size: 13px; color: #3E2723; text-decoration: underline;">Read obituary</a></p>
-        </td></tr>'''
-
-            day_sections += f'''
-    <!-- Day: {day_label} -->
-    <tr><td style="padding: 24px 0 8px 0;">
-        <p style="margin: 0; font-family: Georgia, 'Times New Roman', serif; font-size: 14px; font-weight: 600; color: #5c534a; text-transform: uppercase; letter-spacing: 0.05em;">{day_label}</p>
-    </td></tr>
-    {obit_rows}'''
-
-        html = f'''<!DOCTYPE html>
+# Static skeleton of the weekly digest email; only the greeting and the
+# day sections change between renders.
+_HTML_HEAD = '''<!DOCTYPE html>
 <html>
 <head>
 <meta charset="utf-8">
@@ -156,15 +137,19 @@ class WeeklyDigestSender:
         <span style="font-family: Georgia, 'Times New Roman', serif; font-size: 22px; color: #3E2723; letter-spacing: 0.02em;">Neshama</span>
     </td></tr>
 
-    <!-- Greeting -->
+'''
+
+_HTML_GREETING = Template('''    <!-- Greeting -->
     <tr><td style="padding: 28px 0 0 0; font-family: Georgia, 'Times New Roman', serif; font-size: 16px; line-height: 1.7; color: #3E2723;">
         <p style="margin: 0 0 6px 0;">This week in our community</p>
-        <p style="margin: 0; font-size: 14px; color: #9e9488;">{week_start} &ndash; {week_end}</p>
-        <p style="margin: 16px 0 0 0;">{count} obituar{'y was' if count == 1 else 'ies were'} posted this week.</p>
+        <p style="margin: 0; font-size: 14px; color: #9e9488;">$week_start &ndash; $week_end</p>
+        <p style="margin: 16px 0 0 0;">$count_msg posted this week.</p>
     </td></tr>
 
     <!-- Obituaries by day -->
-    {day_sections}
+    ''')
+
+_HTML_TAIL = '''
 
     <!-- Footer links -->
     <tr><td style="padding: 28px 0 0 0; font-family: Georgia, 'Times New Roman', serif; font-size: 14px; color: #5c534a; line-height: 1.7;">
@@ -174,7 +159,7 @@ class WeeklyDigestSender:
 
     <!-- Footer -->
     <tr><td style="padding-top: 28px; margin-top: 12px; border-top: 1px solid #e8e0d8;">
-        <p style="margin: 0 0 6px 0; font-family: Georgia, 'Times New Roman', serif; font-size: 13px; color: #9e9488; line-height: 1.6;"><a href="{{{{unsubscribe_url}}}}" style="color: #9e9488;">Unsubscribe</a> &middot; <a href="mailto:contact@neshama.ca" style="color: #9e9488;">Contact us</a></p>
+        <p style="margin: 0 0 6px 0; font-family: Georgia, 'Times New Roman', serif; font-size: 13px; color: #9e9488; line-height: 1.6;"><a href="{{unsubscribe_url}}" style="color: #9e9488;">Unsubscribe</a> &middot; <a href="mailto:contact@neshama.ca" style="color: #9e9488;">Contact us</a></p>
         <p style="margin: 0; font-family: Georgia, 'Times New Roman', serif; font-size: 13px; color: #9e9488; line-height: 1.6;">Neshama &middot; Toronto, ON</p>
     </td></tr>
 
@@ -184,22 +169,133 @@ class WeeklyDigestSender:
 </body>
 </html>'''
 
-        return html
 
-    def send_digest_to_subscriber(self, email, unsubscribe_token, html_content, locations=None):
-        """Send weekly digest email to a single subscriber"""
-        if not self.sendgrid_api_key:
-            logging.error(f"[WeeklyDigest] CANNOT send to {email} — no SendGrid API key (TEST MODE)")
-            return {'success': False, 'error': 'No SendGrid API key', 'test_mode': True}
+class WeeklyDigestSender:
+    def __init__(self, db_path='neshama.db', sendgrid_api_key=None):
+        """Initialize weekly digest sender"""
+        self.db_path = db_path
+        self.sendgrid_api_key = sendgrid_api_key or os.environ.get('SENDGRID_API_KEY')
+        self.from_email = 'updates@neshama.ca'
+        self.from_name = 'Neshama'
+        self.subscription_manager = EmailSubscriptionManager(db_path, sendgrid_api_key)
+        # One client for every send in the run (shared by the worker threads)
+        self.sg_client = SendGridAPIClient(self.sendgrid_api_key) if self.sendgrid_api_key else None
+        self._conn = None
+
+    def __del__(self):
+        self.close()
+
+    def _get_conn(self):
+        """One connection for the sender's lifetime, so prepared statements
+        and the page cache survive across queries in a run"""
+        if self._conn is None:
+            # Only the thread driving the run touches it; the send workers never do
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA cache_size = -20000')      # ~20 MB page cache
+            conn.execute('PRAGMA mmap_size = 134217728')    # 128 MB memory-mapped reads
+            conn.execute('PRAGMA temp_store = MEMORY')
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the shared connection (reopened on next use)"""
+        conn, self._conn = getattr(self, '_conn', None), None
+        if conn is None:
+            return
+        # Lets SQLite refresh planner stats for anything this connection queried
+        try:
+            conn.execute('PRAGMA optimize')
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
 
-        unsubscribe_url = f"https://neshama.ca/unsubscribe/{unsubscribe_token}"
-        html_with_unsubscribe = html_content.replace('{{unsubscribe_url}}', unsubscribe_url)
+    def get_weekly_obituaries(self, location=None):
+        """Get obituaries first seen in the last 7 days, optionally filtered by location.
+        Uses first_seen (not last_updated) so name corrections don't cause repeats."""
+        conn = self._get_conn()
+        cursor = conn.cursor()
+
+        cutoff_time = (datetime.now() - timedelta(days=7)).isoformat()
+
+        if location and location in LOCATION_SOURCES:
+            cursor.execute(_WEEKLY_SQL_BY_LOCATION[location], [cutoff_time, *LOCATION_SOURCES[location]])
+        else:
+            cursor.execute(_WEEKLY_SQL_ALL, (cutoff_time,))
+
+        # sqlite3.Row supports row['col'] directly — no need to copy into dicts
+        obituaries = cursor.fetchall()
+
+        return obituaries
+
+    def generate_weekly_html(self, obituaries):
+        """Generate HTML email content for weekly digest, grouped by day.
+        Expects obituaries newest-first, as get_weekly_obituaries returns them.
+        Returns (html, plain) — both still carry the {{unsubscribe_url}} placeholder,
+        so the plain-text body is derived once per template, not once per send."""
+        if not obituaries:
+            return None, None
+
+        count = len(obituaries)
+        now = datetime.now()
+        week_start = (now - timedelta(days=7)).strftime('%B %d')
+        week_end = now.strftime('%B %d, %Y')
+
+        # Obituaries arrive newest-first (as get_weekly_obituaries returns them),
+        # so each day's rows are already contiguous and in order.
+        day_parts = []
+        for day_key, day_obits in groupby(obituaries, key=_obit_day_key):
+            if not day_key:
+                continue  # undated rows have never been listed
+            try:
+                day_label = datetime.strptime(day_key, '%Y-%m-%d').strftime('%A, %B %d')
+            except ValueError:
+                day_label = day_key
+
+            obit_row_parts = []
+            for obit in day_obits:
+                # Read each column once per row
+                hebrew = _row_value(obit, 'hebrew_name')
+                name = obit['deceased_name'] + (_ZL_SUFFIX if hebrew else '')
+                source = _row_value(obit, 'source') or ''
+                url = obit['condolence_url']
+                details = f'<p style="margin: 0 0 4px 0; font-size: 14px; color: #9e9488; direction: rtl; text-align: left;">{hebrew}</p>' if hebrew else ''
+
+                obit_row_parts.append(f'''
+        <tr><td style="padding: 16px 0; border-bottom: 1px solid #f0ebe5;">
+            <p style="margin: 0 0 2px 0; font-family: {_FONT_SERIF}; font-size: 17px; color: #3E2723;">{name}</p>
+            <p style="margin: 0 0 6px 0; font-family: {_FONT_SERIF}; font-size: 12px; color: #9e9488;">{source}</p>
+            {details}
+            <p style="margin: 6px 0 0 0;"><a href="{url}" target="_blank" rel="noopener noreferrer" style="font-family: {_FONT_SERIF}; font-size: 13px; color: #3E2723; text-decoration: underline;">Read obituary</a></p>
+        </td></tr>''')
+
+            obit_rows = ''.join(obit_row_parts)
+            day_parts.append(f'''
+    <!-- Day: {day_label} -->
+    <tr><td style="padding: 24px 0 8px 0;">
+        <p style="margin: 0; font-family: {_FONT_SERIF}; font-size: 14px; font-weight: 600; color: #5c534a; text-transform: uppercase; letter-spacing: 0.05em;">{day_label}</p>
+    </td></tr>
+    {obit_rows}''')
 
+        day_sections = ''.join(day_parts)
+
+        count_msg = f"{count} obituar{'y was' if count == 1 else 'ies were'}"
+        html = ''.join([
+            _HTML_HEAD,
+            _HTML_GREETING.substitute(week_start=week_start, week_end=week_end, count_msg=count_msg),
+            day_sections,
+            _HTML_TAIL,
+        ])
+
+        return html, _html_to_plain(html)
+
+    def digest_subject(self, locations=None):
+        """Location-aware subject line for the weekly digest"""
         now = datetime.now()
         week_start = (now - timedelta(days=7)).strftime('%b %d')
         week_end = now.strftime('%b %d, %Y')
 
-        # Location-aware subject line
         loc_list = [l.strip() for l in (locations or 'toronto,montreal').split(',')]
         if loc_list == ['toronto']:
             community = 'the Toronto Jewish community'
@@ -207,10 +303,20 @@ class WeeklyDigestSender:
             community = 'the Montreal Jewish community'
         else:
             community = 'the Jewish community'
-        subject = f'This week in {community} \u2014 {week_start}\u2013{week_end}'
+        return f'This week in {community} \u2014 {week_start}\u2013{week_end}'
+
+    def send_digest_to_subscriber(self, email, unsubscribe_token, html_content, plain_content, locations=None):
+        """Send weekly digest email to a single subscriber"""
+        if not self.sendgrid_api_key:
+            logging.error(f"[WeeklyDigest] CANNOT send to {email} — no SendGrid API key (TEST MODE)")
+            return {'success': False, 'error': 'No SendGrid API key', 'test_mode': True}
+
+        unsubscribe_url = f"https://neshama.ca/unsubscribe/{unsubscribe_token}"
+        html_with_unsubscribe = html_content.replace('{{unsubscribe_url}}', unsubscribe_url)
+        plain_text = plain_content.replace('{{unsubscribe_url}}', unsubscribe_url)
+        subject = self.digest_subject(locations)
 
         try:
-            plain_text = _html_to_plain(html_with_unsubscribe)
             message = Mail(
                 from_email=Email(self.from_email, self.from_name),
                 to_emails=To(email),
@@ -220,12 +326,10 @@ class WeeklyDigestSender:
             )
 
             # RFC 8058 — required by Gmail/Yahoo for one-click unsubscribe
-            from sendgrid.helpers.mail import Header
             message.header = Header('List-Unsubscribe', f'<{unsubscribe_url}>')
             message.header = Header('List-Unsubscribe-Post', 'List-Unsubscribe=One-Click')
 
-            sg = SendGridAPIClient(self.sendgrid_api_key)
-            response = sg.send(message)
+            response = self.sg_client.send(message)
 
             return {'success': True, 'status_code': response.status_code}
 
@@ -233,6 +337,44 @@ class WeeklyDigestSender:
             logging.error(f"\u274c Failed to send to {email}: {str(e)}")
             return {'success': False, 'error': str(e)}
 
+    def send_digest_batch(self, recipients, html_content, plain_content):
+        """Send one digest body to up to SENDGRID_BATCH_SIZE subscribers in a single request.
+        recipients: list of (email, unsubscribe_token, locations) tuples.
+        Each recipient gets their own personalization (To, subject, unsubscribe link),
+        so nobody sees anyone else's address."""
+        if not self.sendgrid_api_key:
+            logging.error(f"[WeeklyDigest] CANNOT send batch of {len(recipients)} — no SendGrid API key (TEST MODE)")
+            return {'success': False, 'error': 'No SendGrid API key', 'test_mode': True}
+
+        html_template = html_content.replace('{{unsubscribe_url}}', UNSUBSCRIBE_SUBSTITUTION)
+        plain_template = plain_content.replace('{{unsubscribe_url}}', UNSUBSCRIBE_SUBSTITUTION)
+
+        try:
+            message = Mail(
+                from_email=Email(self.from_email, self.from_name),
+                plain_text_content=Content(MimeType.text, plain_template),
+                html_content=Content(MimeType.html, html_template)
+            )
+
+            for email, unsubscribe_token, locations in recipients:
+                unsubscribe_url = f"https://neshama.ca/unsubscribe/{unsubscribe_token}"
+                personalization = Personalization()
+                personalization.add_to(To(email))
+                personalization.subject = self.digest_subject(locations)
+                personalization.add_substitution(Substitution(UNSUBSCRIBE_SUBSTITUTION, unsubscribe_url))
+                # RFC 8058 — required by Gmail/Yahoo for one-click unsubscribe
+                personalization.add_header(Header('List-Unsubscribe', f'<{unsubscribe_url}>'))
+                personalization.add_header(Header('List-Unsubscribe-Post', 'List-Unsubscribe=One-Click'))
+                message.add_personalization(personalization)
+
+            response = self.sg_client.send(message)
+
+            return {'success': True, 'status_code': response.status_code}
+
+        except Exception as e:
+            logging.error(f"\u274c Failed to send batch of {len(recipients)}: {str(e)}")
+            return {'success': False, 'error': str(e)}
+
     def send_weekly_digest(self):
         """Send weekly digest to weekly-frequency subscribers, filtered by location"""
         logging.info(f"\n{'='*70}")
@@ -254,63 +396,85 @@ class WeeklyDigestSender:
 
         logging.info(f" Found {len(all_obituaries)} obituar{'y' if len(all_obituaries) == 1 else 'ies'} this week")
 
-        # Pre-fetch location-filtered lists
-        toronto_obits = self.get_weekly_obituaries(location='toronto')
-        montreal_obits = self.get_weekly_obituaries(location='montreal')
-
         # Get weekly subscribers with preferences
         weekly_subscribers = self.subscription_manager.get_subscribers_by_preference(frequency='weekly')
+        if not weekly_subscribers:
+            logging.info("\u2139\ufe0f No weekly subscribers. Skipping email send.")
+            logging.info(f"\n{'='*70}\n")
+            return {
+                'status': 'skipped',
+                'reason': 'no_subscribers',
+                'subscribers_count': 0
+            }
+
         logging.info(f" Sending to {len(weekly_subscribers)} weekly subscriber{'s' if len(weekly_subscribers) != 1 else ''}\n")
 
-        conn = sqlite3.connect(self.db_path, timeout=30)
-        cursor = conn.cursor()
+        # Group subscribers by location tuple — everyone in a group gets the same
+        # rendered digest, so each group is rendered once and sent in batches.
+        groups = {}
+        for email, unsubscribe_token, frequency, locations in weekly_subscribers:
+            locations = locations or 'toronto,montreal'
+            groups.setdefault(_normalize_locations(locations), []).append((email, unsubscribe_token, locations))
 
         sent_count = 0
         failed_count = 0
         skipped_count = 0
+        sent_updates = []
 
-        for email, unsubscribe_token, frequency, locations in weekly_subscribers:
-            locations = locations or 'toronto,montreal'
-            loc_list = [l.strip() for l in locations.split(',')]
-
-            # Build this subscriber's obituary list
-            subscriber_obits = []
-            if 'toronto' in loc_list:
-                subscriber_obits.extend(toronto_obits)
-            if 'montreal' in loc_list:
-                subscriber_obits.extend(montreal_obits)
-
-            # Deduplicate by id and sort
-            seen = set()
-            unique_obits = []
-            for o in subscriber_obits:
-                if o['id'] not in seen:
-                    seen.add(o['id'])
-                    unique_obits.append(o)
-            unique_obits.sort(key=lambda x: x.get('first_seen') or x.get('last_updated', ''), reverse=True)
-
-            if not unique_obits:
-                skipped_count += 1
-                logging.info(f" \u23ed\ufe0f {email} \u2014 no obits for {locations}")
+        # all_obituaries is already newest-first and unique by id, so filtering
+        # it per location group needs no dedupe or re-sort.
+        obits_by_locations = {
+            loc_tuple: [o for o in all_obituaries if SOURCE_TO_LOCATION.get(o['source']) in loc_tuple]
+            for loc_tuple in groups
+        }
+
+        batches = []
+        for loc_tuple, recipients in groups.items():
+            group_obits = obits_by_locations[loc_tuple]
+            if not group_obits:
+                for email, _token, locations in recipients:
+                    skipped_count += 1
+                    logging.info(f" \u23ed\ufe0f {email} \u2014 no obits for {locations}")
                 continue
 
-            html_content = self.generate_weekly_html(unique_obits)
-            result = self.send_digest_to_subscriber(email, unsubscribe_token, html_content, locations)
-
-            if result.get('success'):
-                sent_count += 1
-                logging.info(f" \u2705 {email} ({len(unique_obits)} obits)")
-                cursor.execute('''
-                    UPDATE subscribers
-                    SET last_email_sent = ?
-                    WHERE email = ?
-                ''', (datetime.now().isoformat(), email))
-            else:
-                failed_count += 1
-                logging.error(f" \u274c {email} \u2014 {result.get('error', 'Unknown error')}")
-
-        conn.commit()
-        conn.close()
+            html_content, plain_content = self.generate_weekly_html(group_obits)
+            for start in range(0, len(recipients), SENDGRID_BATCH_SIZE):
+                batches.append((recipients[start:start + SENDGRID_BATCH_SIZE], html_content, plain_content, len(group_obits)))
+
+        def _send_batch(batch):
+            """Send one batch. Runs on a worker thread."""
+            recipients, html_content, plain_content, obit_count = batch
+            return recipients, self.send_digest_batch(recipients, html_content, plain_content), obit_count
+
+        # SendGrid round-trips are pure I/O, so fan them out across threads.
+        # DB writes stay on this thread — results are consumed via as_completed.
+        max_workers = int(os.environ.get('DIGEST_CONCURRENCY', '20'))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_send_batch, batch) for batch in batches]
+            for future in as_completed(futures):
+                recipients, result, obit_count = future.result()
+
+                sent_at = datetime.now().isoformat()
+                for email, _token, _locations in recipients:
+                    if result.get('success'):
+                        sent_count += 1
+                        logging.info(f" \u2705 {email} ({obit_count} obits)")
+                        sent_updates.append((sent_at, email))
+                    else:
+                        failed_count += 1
+                        logging.error(f" \u274c {email} \u2014 {result.get('error', 'Unknown error')}")
+
+        # One statement, one transaction for every last_email_sent stamp
+        if sent_updates:
+            # Journal mode is database-wide and left to api_server (ensure_wal_mode)
+            conn = self._get_conn()
+            conn.executemany('''
+                UPDATE subscribers
+                SET last_email_sent = ?
+                WHERE email = ?
+            ''', sent_updates)
+            conn.commit()
+        self.close()
 
         logging.info(f"\n{'='*70}")
         logging.info(f" SUMMARY")
@@ -6,27 +6,57 @@ Users subscribe to receive email reminders before the yahrzeit of a loved one,
 with Kaddish text and candle-lighting guidance.
 """
 
+import atexit
+import base64
+import contextlib
+import functools
 import sqlite3
-import uuid
 import secrets
 import os
+import queue
 import re
 import html as html_mod
 import threading
-from datetime import datetime, timedelta
+import time
+import weakref
+from datetime import date, datetime, timedelta
+from itertools import islice
+from string import Template
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 
-# Hebrew date conversion (hdate >= 1.0 API)
+# local@domain.tld — no whitespace, exactly one @, a dot somewhere in the domain
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+# Hebrew date conversion (hdate >= 1.0 API). Imported on first use, so processes
+# that never convert a date don't load it; _load_hdate() fills these in.
+HDATE_AVAILABLE = None  # None until the first _load_hdate()
+HDate = None
+HMonths = None
+_hdate_lock = threading.Lock()
+
+
+def _load_hdate():
+    """Import hdate once per process. Returns HDATE_AVAILABLE."""
+    global HDATE_AVAILABLE, HDate, HMonths
+    if HDATE_AVAILABLE is None:
+        with _hdate_lock:
+            if HDATE_AVAILABLE is None:
+                try:
+                    from hdate import HebrewDate, Months
+                    HDate, HMonths = HebrewDate, Months
+                    HDATE_AVAILABLE = True
+                except ImportError:
+                    HDATE_AVAILABLE = False
+                    logging.warning("[Yahrzeit] hdate library not installed — Hebrew date conversion unavailable")
+    return HDATE_AVAILABLE
+
 try:
-    from hdate import HebrewDate as HDate, Months as HMonths
-    HDATE_AVAILABLE = True
+    from sendgrid import SendGridAPIClient
+    from sendgrid.helpers.mail import Mail, Content, Personalization, Substitution, To
 except ImportError:
-    HDATE_AVAILABLE = False
-    HDate = None
-    HMonths = None
-    logging.warning("[Yahrzeit] hdate library not installed — Hebrew date conversion unavailable")
+    SendGridAPIClient = None  # sends fail (and are logged) if a key is set without sendgrid
 
 
 # Kaddish transliteration for email templates
@@ -57,13 +87,237 @@ Hu ya'aseh shalom aleinu,
 v'al kol Yisrael.
 V'im'ru: Amen."""
 
+# Email bodies, parsed once at import. string.Template ($name) rather than
+# %-formatting so the CSS percentages need no escaping.
+_CONFIRM_HTML = Template('''<!DOCTYPE html>
+<html><head><meta charset="utf-8"></head>
+<body style="margin:0; padding:0; background:#ffffff; font-family:Georgia, 'Times New Roman', serif;">
+<table width="100%" cellpadding="0" cellspacing="0" style="background:#ffffff;">
+<tr><td align="center" style="padding:40px 20px;">
+<table width="100%" style="max-width:560px;">
+    <tr><td style="padding-bottom:32px;">
+        <h1 style="font-family:Georgia, serif; font-size:24px; font-weight:400; color:#3E2723; margin:0 0 8px;">
+            Confirm Your Yahrzeit Reminder
+        </h1>
+        <p style="font-size:16px; color:#3E2723; line-height:1.7; margin:0 0 24px;">
+            You requested an annual yahrzeit reminder for <strong>$safe_name</strong>.
+        </p>
+        $hebrew_line
+        <p style="font-size:15px; color:#3E2723; line-height:1.7; margin:0 0 24px;">
+            Each year before the yahrzeit, we will send you a gentle reminder with the Hebrew date,
+            candle-lighting guidance, and the Mourner's Kaddish.
+        </p>
+        <p style="margin:0 0 32px;">
+            <a href="$confirm_url"
+               style="display:inline-block; background:#3E2723; color:#ffffff; padding:14px 36px;
+                      text-decoration:none; border-radius:6px; font-size:16px; font-family:Georgia, serif;">
+                Confirm My Reminder
+            </a>
+        </p>
+        <p style="font-size:13px; color:#999; margin:0;">
+            This link expires in 72 hours. If you did not request this, you can safely ignore this email.
+        </p>
+    </td></tr>
+    <tr><td style="border-top:1px solid #eee; padding-top:24px;">
+        <p style="font-size:13px; color:#999; text-align:center; margin:0;">
+            Neshama &middot; Taking care of each other
+        </p>
+    </td></tr>
+</table>
+</td></tr>
+</table>
+</body></html>''')
+
+_KADDISH_P = '<p style="font-size:14px; color:#3E2723; line-height:1.8; margin:0 0 16px; font-style:italic;">'
+# Kaddish never changes, so its HTML is built once rather than per reminder
+_KADDISH_HTML = _KADDISH_P + KADDISH_TEXT.replace('\n\n', '</p>' + _KADDISH_P).replace('\n', '<br>') + '</p>'
+
+_REMINDER_HTML = Template('''<!DOCTYPE html>
+<html><head><meta charset="utf-8"></head>
+<body style="margin:0; padding:0; background:#ffffff; font-family:Georgia, 'Times New Roman', serif;">
+<table width="100%" cellpadding="0" cellspacing="0" style="background:#ffffff;">
+<tr><td align="center" style="padding:40px 20px;">
+<table width="100%" style="max-width:560px;">
+    <tr><td style="padding-bottom:32px;">
+        <h1 style="font-family:Georgia, serif; font-size:22px; font-weight:400; color:#3E2723; margin:0 0 16px;">
+            $heading
+        </h1>
+        $intro
+
+        <div style="background:#FAF9F6; border-left:3px solid #D2691E; padding:20px 24px; margin:0 0 24px; border-radius:0 6px 6px 0;">
+            <h2 style="font-family:Georgia, serif; font-size:16px; font-weight:600; color:#3E2723; margin:0 0 8px;">
+                Candle Lighting
+            </h2>
+            <p style="font-size:15px; color:#3E2723; line-height:1.7; margin:0;">
+                It is customary to light a yahrzeit candle at sundown on the evening before the yahrzeit.
+                The candle burns for approximately 24 hours, symbolizing the eternal light of the soul.
+                <em>"The soul of a person is the lamp of God."</em> (Proverbs 20:27)
+            </p>
+        </div>
+
+        <div style="background:#FAF9F6; padding:24px; border-radius:6px; margin:0 0 24px;">
+            <h2 style="font-family:Georgia, serif; font-size:16px; font-weight:600; color:#3E2723; margin:0 0 12px;">
+                Mourner's Kaddish
+            </h2>
+            $kaddish_section
+        </div>
+
+        $memorial_link
+    </td></tr>
+    <tr><td style="border-top:1px solid #eee; padding-top:24px;">
+        <p style="font-size:13px; color:#999; text-align:center; margin:0 0 8px;">
+            Yahrzeit reminders are free, always.
+            <a href="$base_url/sustain" style="color:#D2691E; text-decoration:none;">Help sustain Neshama</a>.
+        </p>
+        <p style="font-size:12px; color:#ccc; text-align:center; margin:0;">
+            <a href="$unsubscribe_url" style="color:#ccc; text-decoration:underline;">Unsubscribe from this reminder</a>
+        </p>
+    </td></tr>
+</table>
+</td></tr>
+</table>
+</body></html>''')
+
+
+# SendGrid accepts up to 1000 personalizations per request
+SENDGRID_BATCH_SIZE = 1000
+# Substitution tags for the per-recipient parts of a batched reminder, in the
+# order YahrzeitManager._reminder_values returns them
+_REMINDER_SUBSTITUTIONS = ('-name_display-', '-hebrew_date-', '-memorial_link-', '-unsubscribe_url-')
+
+
+# Display names indexed by hdate 1.x Months value (Tishrei-first; index 0 unused):
+# TISHREI=1, MARCHESHVAN=2, KISLEV=3, TEVET=4, SHVAT=5, ADAR=6,
+# ADAR_I=7, ADAR_II=8, NISAN=9, IYYAR=10, SIVAN=11, TAMMUZ=12,
+# AV=13, ELUL=14
+_HEBREW_MONTH_NAMES = (
+    '', 'Tishrei', 'Cheshvan', 'Kislev', 'Tevet',
+    'Shevat', 'Adar', 'Adar I', 'Adar II',
+    'Nisan', 'Iyar', 'Sivan', 'Tammuz',
+    'Av', 'Elul',
+)
+
+
+# ── Cached Hebrew calendar math ───────────────────────────────
+# hdate's conversions are pure Python and the processor repeats them for every
+# reminder sharing a date, so memoize. Callers handle errors: lru_cache never
+# stores a raised exception, only successful results.
+
+@functools.lru_cache(maxsize=4096)
+def _hebrew_date_cached(d):
+    hd = HDate.from_gdate(d)
+
+    h_day = hd.day
+    h_month_enum = hd.month
+    h_month = h_month_enum.value  # int
+    h_year = hd.year
+
+    if 1 <= h_month <= 14:
+        month_name = _HEBREW_MONTH_NAMES[h_month]
+    else:
+        month_name = h_month_enum.name.title()
+    hebrew_str = f"{h_day} {month_name} {h_year}"
+
+    return (hebrew_str, h_month, h_day, h_year)
+
+
+@functools.lru_cache(maxsize=4096)
+def _next_yahrzeit_cached(hebrew_month, hebrew_day, today_ordinal):
+    today = date.fromordinal(today_ordinal)
+
+    # Strategy: try to construct a HebrewDate directly for this year and next
+    # hdate 1.x Months: ADAR=6, ADAR_I=7, ADAR_II=8
+    # Get current Hebrew year
+    hd_today = HDate.from_gdate(today)
+    current_h_year = hd_today.year
+
+    for year_offset in range(2):  # Check this year and next
+        h_year = current_h_year + year_offset
+        target_month = hebrew_month
+
+        # Adar edge cases:
+        # If yahrzeit is in ADAR_II (8) but target year is not a leap year,
+        # fall back to ADAR (6)
+        # If yahrzeit is in ADAR_I (7) but target year is not a leap year,
+        # fall back to ADAR (6)
+        try:
+            month_enum = HMonths(target_month)
+            candidate = HDate(year=h_year, month=month_enum, day=hebrew_day)
+            greg_date = candidate.to_gdate()
+            if greg_date >= today:
+                return (greg_date, h_year)
+        except (ValueError, TypeError):
+            # Month doesn't exist in this year (e.g. ADAR_II in non-leap year)
+            # Fall back to ADAR (6)
+            if target_month in (7, 8):  # ADAR_I or ADAR_II
+                try:
+                    fallback = HDate(year=h_year, month=HMonths(6), day=hebrew_day)
+                    greg_date = fallback.to_gdate()
+                    if greg_date >= today:
+                        return (greg_date, h_year)
+                except (ValueError, TypeError):
+                    continue
+            continue
+
+    return None
+
+
+# UPDATE ... RETURNING (one-statement confirm) needs SQLite 3.35+
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Columns the reminder processor reads from each active reminder. Kept in one
+# place because idx_yahr_active_covering must carry exactly these to stay covering.
+_ACTIVE_REMINDER_COLUMNS = (
+    'id, subscriber_email, unsubscribe_token, deceased_name, hebrew_name, '
+    'date_of_death, hebrew_date_of_death, obituary_id, '
+    'last_reminder_hebrew_year, last_reminder_sent'
+)
+
+
+def _serialized(method):
+    """Run method holding the manager's connection lock, so request threads take
+    turns on the one shared connection (see YahrzeitManager._get_conn)."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._conn_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+# Managers that may hold an open connection or queued mail; at interpreter
+# exit (api_server's SIGTERM handler ends in sys.exit) their mail is drained
+# for up to MAIL_FLUSH_TIMEOUT seconds and their connections closed
+_managers = weakref.WeakSet()
+_managers_lock = threading.Lock()
+MAIL_FLUSH_TIMEOUT = 20
+
+
+@atexit.register
+def _close_managers():
+    with _managers_lock:
+        managers = list(_managers)
+    for mgr in managers:
+        if not mgr.flush_mail(timeout=MAIL_FLUSH_TIMEOUT):
+            logging.error(f"[Yahrzeit] {mgr._mail_queue.unfinished_tasks} emails still queued at exit")
+        mgr.close()
+
 
 class YahrzeitManager:
     def __init__(self, db_path='neshama.db'):
         self.db_path = db_path
         self.sendgrid_api_key = os.environ.get('SENDGRID_API_KEY')
         self.base_url = os.environ.get('BASE_URL', 'https://neshama.ca')
+        # One connection shared by every thread, opened on first use (see _get_conn)
+        self._conn = None
+        self._conn_lock = threading.RLock()
+        # Background sender for emails the caller doesn't wait on (see queue_confirmation_email)
+        self._mail_queue = queue.Queue()
+        self._mail_thread = None
+        self._mail_lock = threading.Lock()
+        self._sg = None  # SendGrid client, built on first send and reused after
         self.setup_database()
+        with _managers_lock:
+            _managers.add(self)
 
     # ── Database Setup ────────────────────────────────────────
 
@@ -97,12 +351,35 @@ class YahrzeitManager:
         ''')
 
         # Indexes
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_yahr_email ON yahrzeit_reminders(subscriber_email)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_yahr_confirmed ON yahrzeit_reminders(confirmed)')
+        # Covers subscribe's duplicate check in one seek; its email prefix also serves
+        # any email-only lookup, which made the old single-column index redundant
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_yahr_dup ON yahrzeit_reminders(subscriber_email, date_of_death, deceased_name)')
+        cursor.execute('DROP INDEX IF EXISTS idx_yahr_email')
+        # Partial index holding only the rows the daily cron scans; a plain index on
+        # the boolean confirmed column never narrowed anything. It carries every
+        # column get_active_reminders reads (plus the predicate columns, which this
+        # SQLite needs to treat it as covering), so the scan never touches the table.
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_yahr_active_covering ON yahrzeit_reminders(
+                hebrew_month, hebrew_day, {_ACTIVE_REMINDER_COLUMNS}, confirmed, unsubscribed_at
+            )
+            WHERE confirmed = 1 AND unsubscribed_at IS NULL
+        ''')
+        cursor.execute('DROP INDEX IF EXISTS idx_yahr_active')
+        cursor.execute('DROP INDEX IF EXISTS idx_yahr_confirmed')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_yahr_hebrew_date ON yahrzeit_reminders(hebrew_month, hebrew_day)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_yahr_obituary ON yahrzeit_reminders(obituary_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_yahr_confirm_token ON yahrzeit_reminders(confirmation_token)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_yahr_unsub_token ON yahrzeit_reminders(unsubscribe_token)')
+        # Real selectivity stats so the planner picks the right index for the
+        # duplicate check and the cron scan; close() keeps them fresh with
+        # PRAGMA optimize
+        cursor.execute('ANALYZE yahrzeit_reminders')
+
+        # WAL persists on the file, so once is enough: the reminder cron's scan
+        # no longer blocks subscribe/confirm writers (same mode ensure_wal_mode forces)
+        if conn.execute('PRAGMA journal_mode').fetchone()[0].lower() != 'wal':
+            conn.execute('PRAGMA journal_mode=WAL')
 
         conn.commit()
         conn.close()
@@ -110,15 +387,67 @@ class YahrzeitManager:
     # ── Helpers ───────────────────────────────────────────────
 
     def _get_conn(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """The manager's connection, opened on first use and kept for later calls.
+        Shared by all threads (ThreadingHTTPServer starts one per request), so
+        callers must hold self._conn_lock — public methods do via @_serialized.
+        Autocommit (isolation_level=None): each statement commits on its own, so a
+        failed request can never leave a transaction open on the shared connection."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False,
+                                   isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            # Per-connection settings, paid once for the manager's lifetime;
+            # WAL itself is set once in setup_database
+            conn.execute('PRAGMA synchronous = NORMAL')     # safe under WAL, one fsync fewer per commit
+            conn.execute('PRAGMA cache_size = -20000')      # ~20 MB page cache
+            conn.execute('PRAGMA mmap_size = 268435456')    # 256 MB memory-mapped reads
+            conn.execute('PRAGMA temp_store = MEMORY')
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the shared connection (reopened on next use)."""
+        with self._conn_lock:
+            conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        # Once per connection lifetime: lets SQLite refresh planner stats for
+        # anything this connection queried
+        try:
+            conn.execute('PRAGMA optimize')
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+
+    @contextlib.contextmanager
+    def connection_closed(self):
+        """Close the shared connection and keep every thread off it for the
+        block, e.g. while /admin/unlock-db removes the -wal/-shm files that an
+        open connection would still be using. Reopened on next use after."""
+        with self._conn_lock:
+            conn, self._conn = self._conn, None
+            if conn is not None:
+                conn.close()  # no PRAGMA optimize: the database may be locked
+            yield
 
     def _validate_email(self, email):
         """Basic server-side email validation."""
-        if not email or '@' not in email or '.' not in email.split('@')[-1]:
-            return None
-        return email.strip().lower()[:254]
+        email = (email or '').strip().lower()[:254]
+        return email if _EMAIL_RE.match(email) else None
+
+    def _new_reminder_id(self):
+        """Time-ordered primary key: 13-digit epoch ms + 10 random hex chars.
+        New rows land at the right edge of the primary-key B-tree instead of a
+        random leaf (as uuid4 did). Older uuid4 ids remain valid."""
+        return f"{time.time_ns() // 1_000_000:013d}{secrets.token_hex(5)}"
+
+    def _new_tokens(self):
+        """(confirmation_token, unsubscribe_token): 128 random bits each, URL-safe,
+        both cut from a single 32-byte draw."""
+        raw = secrets.token_bytes(32)
+        return (base64.urlsafe_b64encode(raw[:16]).rstrip(b'=').decode(),
+                base64.urlsafe_b64encode(raw[16:]).rstrip(b'=').decode())
 
     def _sanitize_text(self, value, max_len=500):
         """Truncate text fields to prevent abuse."""
@@ -128,37 +457,18 @@ class YahrzeitManager:
 
     # ── Hebrew Date Conversion ────────────────────────────────
 
-    def convert_to_hebrew_date(self, gregorian_str):
-        """Convert a Gregorian date string (YYYY-MM-DD) to Hebrew date components.
+    def convert_to_hebrew_date(self, gregorian):
+        """Convert a Gregorian date (a date, or a YYYY-MM-DD string) to Hebrew date components.
         Returns: (hebrew_str, hebrew_month, hebrew_day, hebrew_year) or None on failure.
         """
-        if not HDATE_AVAILABLE:
+        if not _load_hdate():
             logging.warning("[Yahrzeit] Cannot convert date — hdate not installed")
             return None
 
         try:
-            d = datetime.strptime(gregorian_str, '%Y-%m-%d').date()
-            hd = HDate.from_gdate(d)
-
-            h_day = hd.day
-            h_month_enum = hd.month
-            h_month = h_month_enum.value  # int
-            h_year = hd.year
-
-            # hdate 1.x Months enum (Tishrei-first):
-            # TISHREI=1, MARCHESHVAN=2, KISLEV=3, TEVET=4, SHVAT=5, ADAR=6,
-            # ADAR_I=7, ADAR_II=8, NISAN=9, IYYAR=10, SIVAN=11, TAMMUZ=12,
-            # AV=13, ELUL=14
-            month_names = {
-                1: 'Tishrei', 2: 'Cheshvan', 3: 'Kislev', 4: 'Tevet',
-                5: 'Shevat', 6: 'Adar', 7: 'Adar I', 8: 'Adar II',
-                9: 'Nisan', 10: 'Iyar', 11: 'Sivan', 12: 'Tammuz',
-                13: 'Av', 14: 'Elul',
-            }
-            month_name = month_names.get(h_month, h_month_enum.name.title())
-            hebrew_str = f"{h_day} {month_name} {h_year}"
-
-            return (hebrew_str, h_month, h_day, h_year)
+            if isinstance(gregorian, str):
+                gregorian = datetime.strptime(gregorian, '%Y-%m-%d').date()
+            return _hebrew_date_cached(gregorian)
         except Exception as e:
             logging.error(f"[Yahrzeit] Hebrew date conversion error: {e}")
             return None
@@ -168,53 +478,43 @@ class YahrzeitManager:
         Handles Adar edge cases for leap/non-leap years.
         Returns: (gregorian_date, hebrew_year) or None.
         """
-        if not HDATE_AVAILABLE:
+        if not _load_hdate():
             return None
 
         try:
-            today = datetime.now().date()
-
-            # Strategy: try to construct a HebrewDate directly for this year and next
-            # hdate 1.x Months: ADAR=6, ADAR_I=7, ADAR_II=8
-            # Get current Hebrew year
-            hd_today = HDate.from_gdate(today)
-            current_h_year = hd_today.year
-
-            for year_offset in range(2):  # Check this year and next
-                h_year = current_h_year + year_offset
-                target_month = hebrew_month
-
-                # Adar edge cases:
-                # If yahrzeit is in ADAR_II (8) but target year is not a leap year,
-                # fall back to ADAR (6)
-                # If yahrzeit is in ADAR_I (7) but target year is not a leap year,
-                # fall back to ADAR (6)
-                try:
-                    month_enum = HMonths(target_month)
-                    candidate = HDate(year=h_year, month=month_enum, day=hebrew_day)
-                    greg_date = candidate.to_gdate()
-                    if greg_date >= today:
-                        return (greg_date, h_year)
-                except (ValueError, TypeError):
-                    # Month doesn't exist in this year (e.g. ADAR_II in non-leap year)
-                    # Fall back to ADAR (6)
-                    if target_month in (7, 8):  # ADAR_I or ADAR_II
-                        try:
-                            fallback = HDate(year=h_year, month=HMonths(6), day=hebrew_day)
-                            greg_date = fallback.to_gdate()
-                            if greg_date >= today:
-                                return (greg_date, h_year)
-                        except (ValueError, TypeError):
-                            continue
-                    continue
-
-            return None
+            # Keyed on today's ordinal so cached answers roll over at midnight
+            return _next_yahrzeit_cached(hebrew_month, hebrew_day, datetime.now().date().toordinal())
         except Exception as e:
             logging.error(f"[Yahrzeit] Next yahrzeit calculation error: {e}")
             return None
 
+    def build_yahrzeit_calendar(self, today=None):
+        """Next occurrence of every Hebrew (month, day), computed once per cron run.
+        today: the date to count from (defaults to the local date), read once for
+        all ~420 lookups.
+        Returns: {(hebrew_month, hebrew_day): (gregorian_date, hebrew_year)}; dates
+        with no upcoming occurrence are left out, so .get() gives None like
+        get_next_yahrzeit_gregorian would.
+        """
+        if not _load_hdate():
+            return {}
+
+        today_ordinal = (today or datetime.now().date()).toordinal()
+        calendar = {}
+        for month in range(1, 15):  # hdate Months values, Adar I/II fallback included
+            for day in range(1, 31):
+                try:
+                    next_yahrzeit = _next_yahrzeit_cached(month, day, today_ordinal)
+                except Exception as e:
+                    logging.error(f"[Yahrzeit] Next yahrzeit calculation error: {e}")
+                    continue
+                if next_yahrzeit:
+                    calendar[(month, day)] = next_yahrzeit
+        return calendar
+
     # ── Subscribe ─────────────────────────────────────────────
 
+    @_serialized
     def subscribe(self, data):
         """Subscribe to yahrzeit reminders.
         data: {deceased_name, date_of_death, email, hebrew_name?, obituary_id?}
@@ -233,14 +533,14 @@ class YahrzeitManager:
         if not email:
             return {'status': 'error', 'message': 'A valid email address is required'}
 
-        # Validate date format
+        # Validate date format (parsed once; the Hebrew conversion reuses it)
         try:
-            datetime.strptime(date_of_death, '%Y-%m-%d')
+            death_date = datetime.strptime(date_of_death, '%Y-%m-%d').date()
         except ValueError:
             return {'status': 'error', 'message': 'Invalid date format. Please use YYYY-MM-DD.'}
 
         # Convert to Hebrew date
-        hebrew_result = self.convert_to_hebrew_date(date_of_death)
+        hebrew_result = self.convert_to_hebrew_date(death_date)
         hebrew_date_str = None
         hebrew_month = None
         hebrew_day = None
@@ -251,6 +551,9 @@ class YahrzeitManager:
         # Check for duplicate (same email + same deceased name + same date)
         conn = self._get_conn()
         try:
+            # Take the write lock before the duplicate check, so concurrent signups
+            # queue here instead of both reading and then racing to upgrade to a write
+            conn.execute('BEGIN IMMEDIATE')
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT id, confirmed, unsubscribed_at FROM yahrzeit_reminders
@@ -261,11 +564,11 @@ class YahrzeitManager:
             if existing:
                 existing = dict(existing)
                 if existing['confirmed'] and not existing['unsubscribed_at']:
+                    conn.execute('ROLLBACK')  # nothing written
                     return {'status': 'error', 'message': 'You already have a yahrzeit reminder set for this person.'}
                 elif existing['unsubscribed_at']:
                     # Re-subscribe: reset the record
-                    new_confirm_token = secrets.token_urlsafe(32)
-                    new_unsub_token = secrets.token_urlsafe(32)
+                    new_confirm_token, new_unsub_token = self._new_tokens()
                     now = datetime.now().isoformat()
                     cursor.execute('''
                         UPDATE yahrzeit_reminders
@@ -277,7 +580,7 @@ class YahrzeitManager:
                     ''', (new_confirm_token, new_unsub_token, now,
                           hebrew_date_str, hebrew_month, hebrew_day, hebrew_name,
                           existing['id']))
-                    conn.commit()
+                    conn.execute('COMMIT')
                     return {
                         'status': 'success',
                         'message': 'Please check your email to confirm your yahrzeit reminder.',
@@ -289,9 +592,8 @@ class YahrzeitManager:
                     }
 
             # Create new record
-            reminder_id = str(uuid.uuid4())
-            confirmation_token = secrets.token_urlsafe(32)
-            unsubscribe_token = secrets.token_urlsafe(32)
+            reminder_id = self._new_reminder_id()
+            confirmation_token, unsubscribe_token = self._new_tokens()
             now = datetime.now().isoformat()
 
             cursor.execute('''
@@ -309,7 +611,7 @@ class YahrzeitManager:
                 confirmation_token, unsubscribe_token,
                 now, now,
             ))
-            conn.commit()
+            conn.execute('COMMIT')
             return {
                 'status': 'success',
                 'message': 'Please check your email to confirm your yahrzeit reminder.',
@@ -320,13 +622,14 @@ class YahrzeitManager:
                 'hebrew_date': hebrew_date_str,
             }
         except Exception as e:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
             logging.error(f"[Yahrzeit] Subscribe error: {e}")
             return {'status': 'error', 'message': 'Something went wrong. Please try again.'}
-        finally:
-            conn.close()
 
     # ── Confirm ───────────────────────────────────────────────
 
+    @_serialized
     def confirm(self, token):
         """Double opt-in confirmation. Token expires after 72 hours."""
         if not token:
@@ -334,43 +637,53 @@ class YahrzeitManager:
 
         conn = self._get_conn()
         cursor = conn.cursor()
+        now = datetime.now()
+
+        row = None
+        if _HAS_RETURNING:
+            # Happy path in one statement: an unconfirmed row whose 72 hours haven't run out.
+            # fetchall() steps the statement to completion so the write finishes here.
+            rows = cursor.execute('''
+                UPDATE yahrzeit_reminders
+                SET confirmed = 1, confirmed_at = ?, confirmation_token = NULL
+                WHERE confirmation_token = ? AND confirmed = 0 AND subscribed_at >= ?
+                RETURNING deceased_name, hebrew_date_of_death
+            ''', (now.isoformat(), token, (now - timedelta(hours=72)).isoformat())).fetchall()
+            if rows:
+                row = dict(rows[0])
+
+        if row is None:
+            # Nothing confirmed above (or no RETURNING): look the token up to say why
+            cursor.execute('''
+                SELECT id, deceased_name, subscriber_email, confirmed, subscribed_at,
+                       hebrew_date_of_death
+                FROM yahrzeit_reminders
+                WHERE confirmation_token = ?
+            ''', (token,))
+            row = cursor.fetchone()
+
+            if not row:
+                return {'status': 'error', 'message': 'Invalid or expired confirmation link'}
+
+            row = dict(row)
+
+            if row['confirmed']:
+                return {
+                    'status': 'already_confirmed',
+                    'message': f'Your yahrzeit reminder for {row["deceased_name"]} is already active.',
+                    'deceased_name': row['deceased_name'],
+                }
+
+            # Check 72-hour expiry
+            subscribed = datetime.fromisoformat(row['subscribed_at'])
+            if now - subscribed > timedelta(hours=72):
+                return {'status': 'error', 'message': 'This confirmation link has expired. Please sign up again.'}
 
-        cursor.execute('''
-            SELECT id, deceased_name, subscriber_email, confirmed, subscribed_at,
-                   hebrew_date_of_death
-            FROM yahrzeit_reminders
-            WHERE confirmation_token = ?
-        ''', (token,))
-        row = cursor.fetchone()
-
-        if not row:
-            conn.close()
-            return {'status': 'error', 'message': 'Invalid or expired confirmation link'}
-
-        row = dict(row)
-
-        if row['confirmed']:
-            conn.close()
-            return {
-                'status': 'already_confirmed',
-                'message': f'Your yahrzeit reminder for {row["deceased_name"]} is already active.',
-                'deceased_name': row['deceased_name'],
-            }
-
-        # Check 72-hour expiry
-        subscribed = datetime.fromisoformat(row['subscribed_at'])
-        if datetime.now() - subscribed > timedelta(hours=72):
-            conn.close()
-            return {'status': 'error', 'message': 'This confirmation link has expired. Please sign up again.'}
-
-        now = datetime.now().isoformat()
-        cursor.execute('''
-            UPDATE yahrzeit_reminders
-            SET confirmed = 1, confirmed_at = ?, confirmation_token = NULL
-            WHERE confirmation_token = ?
-        ''', (now, token))
-        conn.commit()
-        conn.close()
+            cursor.execute('''
+                UPDATE yahrzeit_reminders
+                SET confirmed = 1, confirmed_at = ?, confirmation_token = NULL
+                WHERE confirmation_token = ?
+            ''', (now.isoformat(), token))
 
         return {
             'status': 'success',
@@ -381,6 +694,7 @@ class YahrzeitManager:
 
     # ── Unsubscribe ───────────────────────────────────────────
 
+    @_serialized
     def unsubscribe(self, token):
         """Unsubscribe from yahrzeit reminders."""
         if not token:
@@ -397,13 +711,11 @@ class YahrzeitManager:
         row = cursor.fetchone()
 
         if not row:
-            conn.close()
             return {'status': 'error', 'message': 'Invalid unsubscribe link'}
 
         row = dict(row)
 
         if row['unsubscribed_at']:
-            conn.close()
             return {
                 'status': 'already_unsubscribed',
                 'message': f'You have already unsubscribed from yahrzeit reminders for {row["deceased_name"]}.',
@@ -415,8 +727,6 @@ class YahrzeitManager:
             SET unsubscribed_at = ?
             WHERE unsubscribe_token = ?
         ''', (now, token))
-        conn.commit()
-        conn.close()
 
         return {
             'status': 'success',
@@ -424,6 +734,44 @@ class YahrzeitManager:
             'deceased_name': row['deceased_name'],
         }
 
+    # ── Background Mail ───────────────────────────────────────
+
+    def _sendgrid(self):
+        """The shared SendGrid client for this manager."""
+        if self._sg is None:
+            self._sg = SendGridAPIClient(self.sendgrid_api_key)
+        return self._sg
+
+    def _enqueue_mail(self, send, *args):
+        """Run send(*args) on the mail thread, started on first use."""
+        with self._mail_lock:
+            if self._mail_thread is None:
+                self._mail_thread = threading.Thread(target=self._mail_worker, daemon=True,
+                                                     name='yahrzeit-mail')
+                self._mail_thread.start()
+        self._mail_queue.put((send, args))
+
+    def _mail_worker(self):
+        while True:
+            send, args = self._mail_queue.get()
+            try:
+                send(*args)
+            except Exception as e:
+                logging.error(f"[Yahrzeit] Background email failed: {e}")
+            finally:
+                self._mail_queue.task_done()
+
+    def queue_confirmation_email(self, data):
+        """Send the confirmation email without blocking the signup request."""
+        self._enqueue_mail(self.send_confirmation_email, dict(data))
+
+    def flush_mail(self, timeout=None):
+        """Block until every queued email has been handed to SendGrid, or until
+        timeout seconds pass. Returns True if the queue drained."""
+        mail_queue = self._mail_queue
+        with mail_queue.all_tasks_done:
+            return mail_queue.all_tasks_done.wait_for(lambda: not mail_queue.unfinished_tasks, timeout)
+
     # ── Email Templates ───────────────────────────────────────
 
     def send_confirmation_email(self, data):
@@ -444,49 +792,11 @@ class YahrzeitManager:
         if safe_hebrew:
             hebrew_line = f'<p style="font-size:15px; color:#6b7c6e; margin:0 0 24px;">Hebrew date of passing: <strong>{safe_hebrew}</strong></p>'
 
-        html_content = f'''<!DOCTYPE html>
-<html><head><meta charset="utf-8"></head>
-<body style="margin:0; padding:0; background:#ffffff; font-family:Georgia, 'Times New Roman', serif;">
-<table width="100%" cellpadding="0" cellspacing="0" style="background:#ffffff;">
-<tr><td align="center" style="padding:40px 20px;">
-<table width="100%" style="max-width:560px;">
-    <tr><td style="padding-bottom:32px;">
-        <h1 style="font-family:Georgia, serif; font-size:24px; font-weight:400; color:#3E2723; margin:0 0 8px;">
-            Confirm Your Yahrzeit Reminder
-        </h1>
-        <p style="font-size:16px; color:#3E2723; line-height:1.7; margin:0 0 24px;">
-            You requested an annual yahrzeit reminder for <strong>{safe_name}</strong>.
-        </p>
-        {hebrew_line}
-        <p style="font-size:15px; color:#3E2723; line-height:1.7; margin:0 0 24px;">
-            Each year before the yahrzeit, we will send you a gentle reminder with the Hebrew date,
-            candle-lighting guidance, and the Mourner's Kaddish.
-        </p>
-        <p style="margin:0 0 32px;">
-            <a href="{confirm_url}"
-               style="display:inline-block; background:#3E2723; color:#ffffff; padding:14px 36px;
-                      text-decoration:none; border-radius:6px; font-size:16px; font-family:Georgia, serif;">
-                Confirm My Reminder
-            </a>
-        </p>
-        <p style="font-size:13px; color:#999; margin:0;">
-            This link expires in 72 hours. If you did not request this, you can safely ignore this email.
-        </p>
-    </td></tr>
-    <tr><td style="border-top:1px solid #eee; padding-top:24px;">
-        <p style="font-size:13px; color:#999; text-align:center; margin:0;">
-            Neshama &middot; Taking care of each other
-        </p>
-    </td></tr>
-</table>
-</td></tr>
-</table>
-</body></html>'''
+        html_content = _CONFIRM_HTML.substitute(
+            safe_name=safe_name, hebrew_line=hebrew_line, confirm_url=confirm_url,
+        )
 
         try:
-            from sendgrid import SendGridAPIClient
-            from sendgrid.helpers.mail import Mail, Content
-
             message = Mail(
                 from_email=('reminders@neshama.ca', 'Neshama'),
                 to_emails=data['email'],
@@ -494,23 +804,15 @@ class YahrzeitManager:
             )
             message.content = [Content('text/html', html_content)]
 
-            sg = SendGridAPIClient(self.sendgrid_api_key)
-            response = sg.send(message)
+            response = self._sendgrid().send(message)
             logging.info(f"[Yahrzeit] Confirmation email sent to {data['email']} (status {response.status_code})")
             return response.status_code in (200, 201, 202)
         except Exception as e:
             logging.error(f"[Yahrzeit] Failed to send confirmation email: {e}")
             return False
 
-    def send_yahrzeit_reminder(self, reminder, reminder_type='week_ahead'):
-        """Send a yahrzeit reminder email.
-        reminder: dict row from DB
-        reminder_type: 'week_ahead' or 'day_of'
-        """
-        if not self.sendgrid_api_key:
-            logging.info(f"[Yahrzeit] TEST MODE — {reminder_type} reminder to {reminder['subscriber_email']}")
-            return True
-
+    def _reminder_values(self, reminder):
+        """Per-recipient pieces of a reminder email, HTML-escaped where user-supplied."""
         unsubscribe_url = f"{self.base_url}/yahrzeit/unsubscribe/{reminder['unsubscribe_token']}"
 
         # HTML-escape all user-supplied values
@@ -540,18 +842,25 @@ class YahrzeitManager:
                 </a>
             </p>'''
 
+        # Same order as _REMINDER_SUBSTITUTIONS
+        return (name_display, hebrew_date, memorial_link, unsubscribe_url)
+
+    @staticmethod
+    def _reminder_subject(reminder, reminder_type):
         # Subject uses unescaped name (email subjects don't render HTML)
         raw_name = reminder.get('deceased_name', '')
+        if reminder_type == 'day_of':
+            return f'Today is the yahrzeit of {raw_name}'
+        return f'The yahrzeit of {raw_name} is approaching'
 
+    def _render_reminder(self, reminder_type, name_display, hebrew_date, memorial_link, unsubscribe_url):
         if reminder_type == 'day_of':
-            subject = f'Today is the yahrzeit of {raw_name}'
             heading = f'Today is the Yahrzeit of {name_display}'
             intro = f'''<p style="font-size:16px; color:#3E2723; line-height:1.7; margin:0 0 24px;">
                 Today marks the yahrzeit of <strong>{name_display}</strong>.
                 May their memory be a blessing.
             </p>'''
         else:
-            subject = f'The yahrzeit of {raw_name} is approaching'
             heading = f'The Yahrzeit of {name_display} Is Approaching'
             intro = f'''<p style="font-size:16px; color:#3E2723; line-height:1.7; margin:0 0 12px;">
                 The yahrzeit of <strong>{name_display}</strong> is approaching.
@@ -560,109 +869,160 @@ class YahrzeitManager:
                 Hebrew date: <strong>{hebrew_date}</strong>
             </p>'''
 
-        kaddish_html = KADDISH_TEXT.replace('\n\n', '</p><p style="font-size:14px; color:#3E2723; line-height:1.8; margin:0 0 16px; font-style:italic;">').replace('\n', '<br>')
-        kaddish_section = f'''<p style="font-size:14px; color:#3E2723; line-height:1.8; margin:0 0 16px; font-style:italic;">{kaddish_html}</p>'''
-
-        html_content = f'''<!DOCTYPE html>
-<html><head><meta charset="utf-8"></head>
-<body style="margin:0; padding:0; background:#ffffff; font-family:Georgia, 'Times New Roman', serif;">
-<table width="100%" cellpadding="0" cellspacing="0" style="background:#ffffff;">
-<tr><td align="center" style="padding:40px 20px;">
-<table width="100%" style="max-width:560px;">
-    <tr><td style="padding-bottom:32px;">
-        <h1 style="font-family:Georgia, serif; font-size:22px; font-weight:400; color:#3E2723; margin:0 0 16px;">
-            {heading}
-        </h1>
-        {intro}
-
-        <div style="background:#FAF9F6; border-left:3px solid #D2691E; padding:20px 24px; margin:0 0 24px; border-radius:0 6px 6px 0;">
-            <h2 style="font-family:Georgia, serif; font-size:16px; font-weight:600; color:#3E2723; margin:0 0 8px;">
-                Candle Lighting
-            </h2>
-            <p style="font-size:15px; color:#3E2723; line-height:1.7; margin:0;">
-                It is customary to light a yahrzeit candle at sundown on the evening before the yahrzeit.
-                The candle burns for approximately 24 hours, symbolizing the eternal light of the soul.
-                <em>"The soul of a person is the lamp of God."</em> (Proverbs 20:27)
-            </p>
-        </div>
+        return _REMINDER_HTML.substitute(
+            heading=heading, intro=intro, kaddish_section=_KADDISH_HTML,
+            memorial_link=memorial_link, base_url=self.base_url, unsubscribe_url=unsubscribe_url,
+        )
 
-        <div style="background:#FAF9F6; padding:24px; border-radius:6px; margin:0 0 24px;">
-            <h2 style="font-family:Georgia, serif; font-size:16px; font-weight:600; color:#3E2723; margin:0 0 12px;">
-                Mourner's Kaddish
-            </h2>
-            {kaddish_section}
-        </div>
+    def send_yahrzeit_reminder(self, reminder, reminder_type='week_ahead'):
+        """Send a yahrzeit reminder email.
+        reminder: dict row from DB
+        reminder_type: 'week_ahead' or 'day_of'
+        """
+        if not self.sendgrid_api_key:
+            logging.info(f"[Yahrzeit] TEST MODE — {reminder_type} reminder to {reminder['subscriber_email']}")
+            return True
 
-        {memorial_link}
-    </td></tr>
-    <tr><td style="border-top:1px solid #eee; padding-top:24px;">
-        <p style="font-size:13px; color:#999; text-align:center; margin:0 0 8px;">
-            Yahrzeit reminders are free, always.
-            <a href="{self.base_url}/sustain" style="color:#D2691E; text-decoration:none;">Help sustain Neshama</a>.
-        </p>
-        <p style="font-size:12px; color:#ccc; text-align:center; margin:0;">
-            <a href="{unsubscribe_url}" style="color:#ccc; text-decoration:underline;">Unsubscribe from this reminder</a>
-        </p>
-    </td></tr>
-</table>
-</td></tr>
-</table>
-</body></html>'''
+        html_content = self._render_reminder(reminder_type, *self._reminder_values(reminder))
 
         try:
-            from sendgrid import SendGridAPIClient
-            from sendgrid.helpers.mail import Mail, Content
-
             message = Mail(
                 from_email=('reminders@neshama.ca', 'Neshama'),
                 to_emails=reminder['subscriber_email'],
-                subject=subject,
+                subject=self._reminder_subject(reminder, reminder_type),
             )
             message.content = [Content('text/html', html_content)]
 
-            sg = SendGridAPIClient(self.sendgrid_api_key)
-            response = sg.send(message)
-            logging.info(f"[Yahrzeit] {reminder_type} reminder sent to {reminder['subscriber_email']} for {deceased_name} (status {response.status_code})")
+            response = self._sendgrid().send(message)
+            logging.info(f"[Yahrzeit] {reminder_type} reminder sent to {reminder['subscriber_email']} for {html_mod.escape(reminder.get('deceased_name', ''))} (status {response.status_code})")
             return response.status_code in (200, 201, 202)
         except Exception as e:
             logging.error(f"[Yahrzeit] Failed to send {reminder_type} reminder: {e}")
             return False
 
+    def send_yahrzeit_batch(self, reminders, reminder_type='week_ahead'):
+        """Send one reminder type to many subscribers, SENDGRID_BATCH_SIZE per request.
+        The body is rendered once with substitution tags; each recipient gets their
+        own personalization (To, subject, name, date, links).
+        Returns the reminders SendGrid accepted.
+        """
+        if not self.sendgrid_api_key:
+            for reminder in reminders:
+                logging.info(f"[Yahrzeit] TEST MODE — {reminder_type} reminder to {reminder['subscriber_email']}")
+            return list(reminders)
+
+        html_template = self._render_reminder(reminder_type, *_REMINDER_SUBSTITUTIONS)
+
+        sent = []
+        remaining = iter(reminders)
+        while True:
+            chunk = list(islice(remaining, SENDGRID_BATCH_SIZE))
+            if not chunk:
+                break
+            try:
+                message = Mail(from_email=('reminders@neshama.ca', 'Neshama'))
+                message.content = [Content('text/html', html_template)]
+                for reminder in chunk:
+                    personalization = Personalization()
+                    personalization.add_to(To(reminder['subscriber_email']))
+                    personalization.subject = self._reminder_subject(reminder, reminder_type)
+                    for tag, value in zip(_REMINDER_SUBSTITUTIONS, self._reminder_values(reminder)):
+                        personalization.add_substitution(Substitution(tag, value))
+                    message.add_personalization(personalization)
+
+                response = self._sendgrid().send(message)
+                logging.info(f"[Yahrzeit] {reminder_type} reminders sent to {len(chunk)} subscribers (status {response.status_code})")
+                if response.status_code in (200, 201, 202):
+                    sent.extend(chunk)
+            except Exception as e:
+                logging.error(f"[Yahrzeit] Failed to send batch of {len(chunk)} {reminder_type} reminders: {e}")
+        return sent
+
     # ── Get All Active Reminders (for processor) ──────────────
 
+    def iter_active_reminders(self):
+        """Yield confirmed, non-unsubscribed reminders as dicts.
+        Only the reminder columns are read, straight from idx_yahr_active_covering.
+        The rows are fetched under the connection lock and yielded after it is
+        released, so a slow consumer never holds up request threads."""
+        with self._conn_lock:
+            rows = self._get_conn().execute(f'''
+                SELECT hebrew_month, hebrew_day, {_ACTIVE_REMINDER_COLUMNS}
+                FROM yahrzeit_reminders
+                WHERE confirmed = 1 AND unsubscribed_at IS NULL
+            ''').fetchall()
+        for row in rows:
+            yield dict(row)
+
     def get_active_reminders(self):
-        """Get all confirmed, non-unsubscribed reminders."""
+        """Get all confirmed, non-unsubscribed reminders as a list of dicts.
+        The daily processor doesn't use this; it loads only the reminders due
+        that day through get_reminders_due."""
+        return list(self.iter_active_reminders())
+
+    @_serialized
+    def get_reminders_due(self, due_years):
+        """Reminders with a send due, in one query.
+        due_years: {(hebrew_month, hebrew_day): hebrew_year} for every Hebrew date
+        whose yahrzeit falls on a send day. Only rows on those dates not yet sent
+        for that Hebrew year come back, each with its target year as 'due_hebrew_year',
+        seeking idx_yahr_active_covering on its (hebrew_month, hebrew_day) prefix.
+        Rows missing a stored Hebrew date (subscribe sets month and day together)
+        can't be matched in SQL, so they are appended with due_hebrew_year None
+        for the caller to resolve."""
         conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM yahrzeit_reminders
+        due = [(month, day, year) for (month, day), year in due_years.items()]
+        rows = []
+        # One VALUES row per due date; stays far below SQLite's variable limit
+        if due:
+            values = ', '.join(['(?, ?, ?)'] * len(due))
+            rows = conn.execute(f'''
+                WITH due(due_month, due_day, due_hebrew_year) AS (VALUES {values})
+                SELECT hebrew_month, hebrew_day, {_ACTIVE_REMINDER_COLUMNS}, due_hebrew_year
+                FROM due
+                JOIN yahrzeit_reminders
+                  ON hebrew_month = due_month AND hebrew_day = due_day
+                WHERE confirmed = 1 AND unsubscribed_at IS NULL
+                  AND (last_reminder_hebrew_year IS NULL OR last_reminder_hebrew_year < due_hebrew_year)
+            ''', [v for row in due for v in row]).fetchall()
+        rows += conn.execute(f'''
+            SELECT hebrew_month, hebrew_day, {_ACTIVE_REMINDER_COLUMNS}, NULL AS due_hebrew_year
+            FROM yahrzeit_reminders
             WHERE confirmed = 1 AND unsubscribed_at IS NULL
-        ''')
-        rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return rows
+              AND hebrew_month IS NULL
+        ''').fetchall()
+        return [dict(row) for row in rows]
+
+    @_serialized
+    def bulk_update_reminder_sent(self, sent):
+        """Stamp last_reminder_sent on many reminders in one transaction.
+        sent: iterable of (reminder_id, hebrew_year) pairs. hebrew_year=None only
+        updates the timestamp (week-ahead reminders); otherwise the Hebrew year is
+        recorded too (day-of reminders), which stops further sends for that year."""
+        now = datetime.now().isoformat()
+        params = [(now, hebrew_year, reminder_id) for reminder_id, hebrew_year in sent]
+        if not params:
+            return
+        conn = self._get_conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany('''
+                UPDATE yahrzeit_reminders
+                SET last_reminder_sent = ?,
+                    last_reminder_hebrew_year = COALESCE(?, last_reminder_hebrew_year)
+                WHERE id = ?
+            ''', params)
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
 
     def update_reminder_sent(self, reminder_id, hebrew_year):
-        """Mark a reminder as sent for a specific Hebrew year."""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        now = datetime.now().isoformat()
-        cursor.execute('''
-            UPDATE yahrzeit_reminders
-            SET last_reminder_sent = ?, last_reminder_hebrew_year = ?
-            WHERE id = ?
-        ''', (now, hebrew_year, reminder_id))
-        conn.commit()
-        conn.close()
+        """Mark a reminder as sent for a specific Hebrew year.
+        Deprecated: batch with bulk_update_reminder_sent instead."""
+        self.bulk_update_reminder_sent([(reminder_id, hebrew_year)])
 
     def update_reminder_timestamp(self, reminder_id):
-        """Update last_reminder_sent timestamp only (for week-ahead reminders)."""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        now = datetime.now().isoformat()
-        cursor.execute(
-            'UPDATE yahrzeit_reminders SET last_reminder_sent = ? WHERE id = ?',
-            (now, reminder_id)
-        )
-        conn.commit()
-        conn.close()
+        """Update last_reminder_sent timestamp only (for week-ahead reminders).
+        Deprecated: batch with bulk_update_reminder_sent instead."""
+        self.bulk_update_reminder_sent([(reminder_id, None)])
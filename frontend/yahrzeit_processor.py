@@ -6,6 +6,7 @@ Called by APScheduler once daily at 9 AM Toronto time.
 """
 
 import logging
+import sqlite3
 from datetime import datetime, timedelta
 
 import pytz
@@ -14,17 +15,38 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(me
 
 TORONTO_TZ = pytz.timezone('America/Toronto')
 
+# Shabbat pause as hours of the week: Friday 6 PM up to Saturday 9 PM
+_SHABBAT_PAUSE_START = 4 * 24 + 18
+_SHABBAT_PAUSE_END = 5 * 24 + 21
 
-def is_shabbat_pause():
-    """Check if we're in the Shabbat pause window (Fri 6PM - Sat 9PM Toronto time)."""
-    now = datetime.now(TORONTO_TZ)
-    weekday = now.weekday()  # 0=Mon, 4=Fri, 5=Sat
 
-    if weekday == 4 and now.hour >= 18:  # Friday after 6 PM
-        return True
-    if weekday == 5 and now.hour < 21:   # Saturday before 9 PM
-        return True
-    return False
+def is_shabbat_pause(now=None):
+    """Check if we're in the Shabbat pause window (Fri 6PM - Sat 9PM Toronto time).
+    now: a Toronto-aware datetime, when the caller has already read the clock."""
+    if now is None:
+        now = datetime.now(TORONTO_TZ)
+    # Hour of the week, Monday 00:00 = 0 (weekday 0=Mon, 4=Fri, 5=Sat)
+    hour_of_week = now.weekday() * 24 + now.hour
+    return _SHABBAT_PAUSE_START <= hour_of_week < _SHABBAT_PAUSE_END
+
+
+def has_active_reminders(db_path):
+    """Cheap pre-check: is there any confirmed, non-unsubscribed reminder at all?
+    One LIMIT 1 probe of the active partial index on a short-lived connection,
+    so a quiet day never builds the manager (schema setup, ANALYZE) or the
+    Hebrew calendar. Any error other than a missing table says yes and leaves
+    the real run to report it."""
+    try:
+        conn = sqlite3.connect(db_path, timeout=30)
+        try:
+            row = conn.execute(
+                'SELECT 1 FROM yahrzeit_reminders WHERE confirmed = 1 AND unsubscribed_at IS NULL LIMIT 1'
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return 'no such table' not in str(e)
+    return row is not None
 
 
 def process_yahrzeit_reminders(db_path):
@@ -32,17 +54,23 @@ def process_yahrzeit_reminders(db_path):
     Called daily by APScheduler.
 
     Logic:
-    - For each confirmed, non-unsubscribed reminder:
-      - Compute next yahrzeit Gregorian date
+    - Find the Hebrew dates whose next yahrzeit is today or 7 days out, and load
+      only the confirmed, non-unsubscribed reminders on those dates:
       - 7 days before: send week-ahead reminder (if not already sent this Hebrew year)
       - Day-of: send day-of reminder (if not already sent this Hebrew year)
     - Respects Shabbat pause
     - Tracks last_reminder_hebrew_year to prevent duplicate sends
     """
-    if is_shabbat_pause():
+    # Read the clock once; the pause check and every due-date comparison share it
+    now_toronto = datetime.now(TORONTO_TZ)
+    if is_shabbat_pause(now_toronto):
         logging.info("[Yahrzeit] Shabbat pause — skipping reminder processing")
         return
 
+    if not has_active_reminders(db_path):
+        logging.info("[Yahrzeit] No active reminders to process")
+        return
+
     try:
         from yahrzeit_manager import YahrzeitManager
         mgr = YahrzeitManager(db_path=db_path)
@@ -50,19 +78,43 @@ def process_yahrzeit_reminders(db_path):
         logging.error(f"[Yahrzeit] Failed to initialize manager: {e}")
         return
 
-    reminders = mgr.get_active_reminders()
+    try:
+        _send_due_reminders(mgr, now_toronto)
+    finally:
+        # The batch is done with the connection; close() also runs PRAGMA optimize
+        mgr.close()
+
+
+def _send_due_reminders(mgr, now_toronto):
+    """Send the reminders due at now_toronto and record them (see process_yahrzeit_reminders)."""
+    today = now_toronto.date()
+    today_ordinal = today.toordinal()
+    # ~400 Hebrew dates cover every reminder, so resolve them all up front
+    calendar = mgr.build_yahrzeit_calendar(today)
+    # Only Hebrew dates whose yahrzeit is today or a week out can send anything;
+    # the query hands back just their reminders not yet sent for that year
+    due_years = {}
+    for key, next_yahrzeit in calendar.items():
+        if next_yahrzeit and next_yahrzeit[0].toordinal() - today_ordinal in (0, 7):
+            due_years[key] = next_yahrzeit[1]
+    reminders = mgr.get_reminders_due(due_years)
     if not reminders:
-        logging.info("[Yahrzeit] No active reminders to process")
+        logging.info("[Yahrzeit] No reminders due today")
         return
 
-    today = datetime.now().date()
     sent_count = 0
     error_count = 0
+    # (reminder_id, hebrew_year or None) per successful send, written in one transaction
+    sent_markers = []
+    # Reminders due today, grouped so each type goes out as batched SendGrid requests
+    due_day_of = []      # (reminder, hebrew_year)
+    due_week_ahead = []
 
     for reminder in reminders:
         try:
-            h_month = reminder.get('hebrew_month')
-            h_day = reminder.get('hebrew_day')
+            # Every row from get_reminders_due carries these keys, so index directly
+            h_month = reminder['hebrew_month']
+            h_day = reminder['hebrew_day']
 
             if not h_month or not h_day:
                 # Try to re-convert if Hebrew date data is missing
@@ -73,42 +125,54 @@ def process_yahrzeit_reminders(db_path):
                     continue
 
             # Get next yahrzeit date
-            next_yahrzeit = mgr.get_next_yahrzeit_gregorian(h_month, h_day)
+            next_yahrzeit = calendar.get((h_month, h_day))
             if not next_yahrzeit:
                 continue
 
             yahrzeit_date, hebrew_year = next_yahrzeit
-            days_until = (yahrzeit_date - today).days
+            days_until = yahrzeit_date.toordinal() - today_ordinal
 
-            # Skip if we already sent a reminder for this Hebrew year
-            last_year = reminder.get('last_reminder_hebrew_year')
-            if last_year and last_year >= hebrew_year:
-                continue
+            # The query already dropped rows sent for this Hebrew year, except
+            # the ones it couldn't date (due_hebrew_year None) — check those here
+            if reminder['due_hebrew_year'] is None:
+                last_year = reminder['last_reminder_hebrew_year']
+                if last_year and last_year >= hebrew_year:
+                    continue
 
             # Day-of reminder
             if days_until == 0:
-                success = mgr.send_yahrzeit_reminder(reminder, 'day_of')
-                if success:
-                    mgr.update_reminder_sent(reminder['id'], hebrew_year)
-                    sent_count += 1
-                    logging.info(f"[Yahrzeit] Day-of reminder sent for {reminder['deceased_name']}")
-                else:
-                    error_count += 1
+                due_day_of.append((reminder, hebrew_year))
 
             # Week-ahead reminder (7 days before)
             elif days_until == 7:
-                success = mgr.send_yahrzeit_reminder(reminder, 'week_ahead')
-                if success:
-                    # Don't update last_reminder_hebrew_year yet — save that for day-of
-                    # But do update last_reminder_sent timestamp
-                    mgr.update_reminder_timestamp(reminder['id'])
-                    sent_count += 1
-                    logging.info(f"[Yahrzeit] Week-ahead reminder sent for {reminder['deceased_name']}")
-                else:
-                    error_count += 1
+                due_week_ahead.append((reminder, hebrew_year))
 
         except Exception as e:
-            logging.error(f"[Yahrzeit] Error processing reminder {reminder.get('id', '?')}: {e}")
+            logging.error("[Yahrzeit] Error processing reminder %s: %s", reminder.get('id', '?'), e)
             error_count += 1
 
-    logging.info(f"[Yahrzeit] Processing complete: {sent_count} sent, {error_count} errors, {len(reminders)} total")
+    for reminder_type, due in (('day_of', due_day_of), ('week_ahead', due_week_ahead)):
+        if not due:
+            continue
+        sent_ids = {r['id'] for r in mgr.send_yahrzeit_batch([r for r, _ in due], reminder_type)}
+        for reminder, hebrew_year in due:
+            if reminder['id'] not in sent_ids:
+                error_count += 1
+                continue
+            sent_count += 1
+            if reminder_type == 'day_of':
+                sent_markers.append((reminder['id'], hebrew_year))
+                logging.info("[Yahrzeit] Day-of reminder sent for %s", reminder['deceased_name'])
+            else:
+                # Don't update last_reminder_hebrew_year yet — save that for day-of
+                # But do update last_reminder_sent timestamp
+                sent_markers.append((reminder['id'], None))
+                logging.info("[Yahrzeit] Week-ahead reminder sent for %s", reminder['deceased_name'])
+
+    if sent_markers:
+        try:
+            mgr.bulk_update_reminder_sent(sent_markers)
+        except Exception as e:
+            logging.error(f"[Yahrzeit] Failed to record {len(sent_markers)} sent reminders: {e}")
+
+    logging.info(f"[Yahrzeit] Processing complete: {sent_count} sent, {error_count} errors, {len(reminders)} due")
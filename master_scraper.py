@@ -5,50 +5,126 @@ Neshama Master Scraper
 Runs all funeral home scrapers and manages scheduling
 """
 
+import functools
+import importlib
+import importlib.util
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import sys
 import os
 
-# Import individual scrapers (original 4 — Toronto + Montreal)
-from steeles_scraper import SteelesScraper
-from benjamins_scraper import BenjaminsScraper
-from paperman_scraper import PapermanScraper
-from misaskim_scraper import MisakimScraper
 from database_setup import NeshamaDatabase
 
-# Import city config and expansion scrapers
+# Import city config
 from city_config import CITIES
 
-# Map of scraper type keywords to their scraper classes.
+# Scraper classes are named as 'module:Class' and imported only when that
+# scraper runs (_load_scraper_class), so 'status' never pulls in requests,
+# BeautifulSoup or any scraper module.
+
+# Map of scraper type keywords to their scraper classes ('module:Class').
 # When a city in city_config lists a scraper name here, the master
 # scraper will automatically instantiate and run it.
 EXPANSION_SCRAPER_REGISTRY = {}
 
-try:
-    from dignity_memorial_scraper import DignityMemorialScraper
-    EXPANSION_SCRAPER_REGISTRY['dignity_memorial'] = DignityMemorialScraper
-except ImportError:
-    pass  # dignity_memorial_scraper not available
+if importlib.util.find_spec('dignity_memorial_scraper') is not None:
+    EXPANSION_SCRAPER_REGISTRY['dignity_memorial'] = 'dignity_memorial_scraper:DignityMemorialScraper'
+
+# Original 4 scrapers (Toronto + Montreal), keyed by CLI command:
+# (display name, scraper class). Instances are built on first use, so a
+# single-scraper run doesn't open a requests.Session for every funeral home.
+CORE_SCRAPER_REGISTRY = {
+    'steeles': ('Steeles', 'steeles_scraper:SteelesScraper'),
+    'benjamins': ('Benjamin\'s', 'benjamins_scraper:BenjaminsScraper'),
+    'paperman': ('Paperman', 'paperman_scraper:PapermanScraper'),
+    'misaskim': ('Misaskim', 'misaskim_scraper:MisakimScraper'),
+}
+
+
+def _load_scraper_class(spec):
+    """Import and return the class named by a 'module:Class' registry entry."""
+    module_name, _, class_name = spec.partition(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _run_instance(scraper_cls, city_slug):
+    return scraper_cls(city_slug=city_slug).run()
+
+
+def _run_job(name, run, is_expansion):
+    """Run one scraper and report (name, is_expansion, stats, error) instead of
+    raising, so one failure can't cancel the others."""
+    if is_expansion:
+        logging.info("\n>> Starting expansion scraper: %s...", name)
+    else:
+        logging.info("\n▶ Starting %s scraper...", name)
+    try:
+        return name, is_expansion, run(), None
+    except Exception as e:
+        return name, is_expansion, None, e
 
 
 class MasterScraper:
     def __init__(self):
-        # Original 4 scrapers — unchanged
-        self.scrapers = [
-            ('Steeles', SteelesScraper()),
-            ('Benjamin\'s', BenjaminsScraper()),
-            ('Paperman', PapermanScraper()),
-            ('Misaskim', MisakimScraper())
-        ]
+        self._scrapers = None
         self.db = NeshamaDatabase()
 
+    @property
+    def scrapers(self):
+        """[(display name, scraper instance)] for the core scrapers, built once."""
+        if self._scrapers is None:
+            self._scrapers = [(name, _load_scraper_class(spec)())
+                              for name, spec in CORE_SCRAPER_REGISTRY.values()]
+        return self._scrapers
+
+    @scrapers.setter
+    def scrapers(self, value):
+        self._scrapers = value
+
+    def _scraper_jobs(self):
+        """(display name, zero-arg run callable, is_expansion) for every scraper
+        run_all_scrapers covers: the original 4, then city_config expansions."""
+        jobs = [(name, scraper.run, False) for name, scraper in self.scrapers]
+
+        # ── Expansion scrapers from city_config ──
+        # These are cities that define scraper types in EXPANSION_SCRAPER_REGISTRY
+        # (e.g. 'dignity_memorial' for South Florida, NYC, LA).
+        for city_slug, city_cfg in CITIES.items():
+            for scraper_key in city_cfg.get('scrapers', []):
+                if scraper_key in EXPANSION_SCRAPER_REGISTRY:
+                    try:
+                        scraper_cls = _load_scraper_class(EXPANSION_SCRAPER_REGISTRY[scraper_key])
+                    except ImportError as e:
+                        logging.info("%s scraper not available: %s", scraper_key, e)
+                        continue
+                    display = f"{scraper_key} ({city_cfg['display_name']})"
+                    # Expansion scrapers with run_for_city() class method
+                    if hasattr(scraper_cls, 'run_for_city'):
+                        run = functools.partial(scraper_cls.run_for_city, city_slug)
+                    else:
+                        # Fallback: instantiate directly (inside the worker, so the
+                        # instance's session and DB connection stay on one thread)
+                        run = functools.partial(_run_instance, scraper_cls, city_slug)
+                    jobs.append((display, run, True))
+        return jobs
+
     def run_all_scrapers(self):
-        """Run all scrapers sequentially"""
-        logging.info(f"\n{'='*70}")
-        logging.info(f" NESHAMA MASTER SCRAPER")
-        logging.info(f" Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        logging.info(f"{'='*70}\n")
+        """Run all scrapers, several at once.
+
+        Scrapers spend nearly all their time waiting on funeral home sites, so
+        running them on threads brings wall time down to roughly the slowest
+        one. Each scraper owns its own requests.Session and NeshamaDatabase, so
+        nothing is shared between threads. NESHAMA_SCRAPER_PARALLEL caps the
+        thread count; set it to 1 for the old sequential behaviour.
+        """
+        # Banner and summary go out as one record each: one handler write apiece
+        logging.info("\n".join([
+            f"\n{'='*70}",
+            " NESHAMA MASTER SCRAPER",
+            f" Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"{'='*70}\n",
+        ]))
 
         total_stats = {
             'scrapers_run': 0,
@@ -59,66 +135,45 @@ class MasterScraper:
             'total_updated': 0
         }
 
-        for name, scraper in self.scrapers:
-            try:
-                logging.info(f"\n▶ Starting {name} scraper...")
-                stats = scraper.run()
+        jobs = self._scraper_jobs()
+        max_workers = int(os.environ.get('NESHAMA_SCRAPER_PARALLEL', str(len(jobs) or 1)))
 
-                total_stats['scrapers_run'] += 1
+        if max_workers <= 1:
+            results = [_run_job(*job) for job in jobs]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_run_job, *job) for job in jobs]
+                results = [future.result() for future in as_completed(futures)]
+
+        # Stats are tallied here on the calling thread, so no locking is needed
+        for name, is_expansion, stats, error in results:
+            total_stats['scrapers_run'] += 1
+            if error is None:
                 total_stats['scrapers_succeeded'] += 1
                 total_stats['total_found'] += stats.get('found', 0)
                 total_stats['total_new'] += stats.get('new', 0)
                 total_stats['total_updated'] += stats.get('updated', 0)
-
-            except Exception as e:
-                total_stats['scrapers_run'] += 1
+            else:
+                # Other scrapers carry on even if one fails
                 total_stats['scrapers_failed'] += 1
-                logging.info(f"\n❌ {name} scraper failed: {str(e)}\n")
-
-                # Continue with next scraper even if one fails
-                continue
-
-        # ── Run expansion scrapers from city_config ──
-        # These are cities that define scraper types in EXPANSION_SCRAPER_REGISTRY
-        # (e.g. 'dignity_memorial' for South Florida, NYC, LA).
-        for city_slug, city_cfg in CITIES.items():
-            for scraper_key in city_cfg.get('scrapers', []):
-                if scraper_key in EXPANSION_SCRAPER_REGISTRY:
-                    scraper_cls = EXPANSION_SCRAPER_REGISTRY[scraper_key]
-                    display = f"{scraper_key} ({city_cfg['display_name']})"
-                    try:
-                        logging.info(f"\n>> Starting expansion scraper: {display}...")
-                        # Expansion scrapers with run_for_city() class method
-                        if hasattr(scraper_cls, 'run_for_city'):
-                            stats = scraper_cls.run_for_city(city_slug)
-                        else:
-                            # Fallback: instantiate directly
-                            scraper_instance = scraper_cls(city_slug=city_slug)
-                            stats = scraper_instance.run()
-
-                        total_stats['scrapers_run'] += 1
-                        total_stats['scrapers_succeeded'] += 1
-                        total_stats['total_found'] += stats.get('found', 0)
-                        total_stats['total_new'] += stats.get('new', 0)
-                        total_stats['total_updated'] += stats.get('updated', 0)
-
-                    except Exception as e:
-                        total_stats['scrapers_run'] += 1
-                        total_stats['scrapers_failed'] += 1
-                        logging.info(f"\n!! {display} scraper failed: {str(e)}\n")
-                        continue
+                if is_expansion:
+                    logging.info("\n!! %s scraper failed: %s\n", name, error)
+                else:
+                    logging.info("\n❌ %s scraper failed: %s\n", name, error)
 
         # Print summary
-        logging.info(f"\n{'='*70}")
-        logging.info(f" SUMMARY")
-        logging.info(f"{'='*70}")
-        logging.info(f" Scrapers run:      {total_stats['scrapers_run']}")
-        logging.info(f" Succeeded:         {total_stats['scrapers_succeeded']}")
-        logging.info(f" Failed:            {total_stats['scrapers_failed']}")
-        logging.info(f" Total found:       {total_stats['total_found']}")
-        logging.info(f" New obituaries:    {total_stats['total_new']}")
-        logging.info(f" Updated:           {total_stats['total_updated']}")
-        logging.info(f"{'='*70}\n")
+        logging.info("\n".join([
+            f"\n{'='*70}",
+            " SUMMARY",
+            f"{'='*70}",
+            f" Scrapers run:      {total_stats['scrapers_run']}",
+            f" Succeeded:         {total_stats['scrapers_succeeded']}",
+            f" Failed:            {total_stats['scrapers_failed']}",
+            f" Total found:       {total_stats['total_found']}",
+            f" New obituaries:    {total_stats['total_new']}",
+            f" Updated:           {total_stats['total_updated']}",
+            f"{'='*70}\n",
+        ]))
 
         return total_stats
 
@@ -126,16 +181,27 @@ class MasterScraper:
         """Run a specific scraper by name"""
         scraper_name_lower = scraper_name.lower()
 
-        # Check original 4 scrapers
-        for name, scraper in self.scrapers:
-            if name.lower().startswith(scraper_name_lower):
-                logging.info(f"\nRunning {name} scraper...\n")
-                stats = scraper.run()
-                return stats
+        # Check original 4 scrapers; only the matching one is constructed.
+        # CLI commands are exact registry keys; a prefix ('steel') still works.
+        entry = CORE_SCRAPER_REGISTRY.get(scraper_name_lower)
+        if entry is None:
+            entry = next((v for k, v in CORE_SCRAPER_REGISTRY.items()
+                          if k.startswith(scraper_name_lower)), None)
+        if entry is not None:
+            name, spec = entry
+            logging.info(f"\nRunning {name} scraper...\n")
+            stats = _load_scraper_class(spec)().run()
+            return stats
 
         # Check expansion scrapers (e.g. 'dignity_memorial')
         if scraper_name_lower in EXPANSION_SCRAPER_REGISTRY:
-            scraper_cls = EXPANSION_SCRAPER_REGISTRY[scraper_name_lower]
+            # The registry only knows the module file exists; its own imports
+            # (e.g. cloudscraper) may still be missing
+            try:
+                scraper_cls = _load_scraper_class(EXPANSION_SCRAPER_REGISTRY[scraper_name_lower])
+            except ImportError as e:
+                logging.info("%s scraper not available: %s", scraper_name_lower, e)
+                return None
             logging.info(f"\nRunning {scraper_name_lower} expansion scraper for all configured cities...\n")
             combined_stats = {'found': 0, 'new': 0, 'updated': 0, 'errors': 0}
             for city_slug, city_cfg in CITIES.items():
@@ -148,7 +214,7 @@ class MasterScraper:
                         combined_stats[k] += stats.get(k, 0)
             return combined_stats
 
-        available = ['steeles', 'benjamins', 'paperman', 'misaskim']
+        available = list(CORE_SCRAPER_REGISTRY)
         available.extend(EXPANSION_SCRAPER_REGISTRY.keys())
         logging.info(f"Scraper '{scraper_name}' not found")
         logging.info(f"Available scrapers: {', '.join(available)}")
@@ -157,23 +223,26 @@ class MasterScraper:
     def check_database_status(self):
         """Display current database statistics"""
         try:
-            self.db.connect()
-
-            # Count total obituaries
-            self.db.cursor.execute('SELECT COUNT(*) FROM obituaries')
-            total_obits = self.db.cursor.fetchone()[0]
+            self.db.connect_readonly()
 
-            # Count by source
+            # Counts by source plus the comment total in one statement; source is
+            # NOT NULL, so the NULL-source row is the comments count. The
+            # obituary total is the sum of the per-source counts.
             self.db.cursor.execute('''
                 SELECT source, COUNT(*)
                 FROM obituaries
                 GROUP BY source
+                UNION ALL
+                SELECT NULL, COUNT(*) FROM comments
             ''')
-            by_source = self.db.cursor.fetchall()
-
-            # Count total comments
-            self.db.cursor.execute('SELECT COUNT(*) FROM comments')
-            total_comments = self.db.cursor.fetchone()[0]
+            by_source = []
+            total_comments = 0
+            for source, count in self.db.cursor.fetchall():
+                if source is None:
+                    total_comments = count
+                else:
+                    by_source.append((source, count))
+            total_obits = sum(count for _, count in by_source)
 
             # Recent obituaries
             self.db.cursor.execute('''
@@ -195,30 +264,32 @@ class MasterScraper:
 
             self.db.close()
 
-            # Display stats
-            logging.info(f"\n{'='*70}")
-            logging.info(f" DATABASE STATUS")
-            logging.info(f"{'='*70}")
-            logging.info(f"\n Total obituaries:  {total_obits}")
-            logging.info(f" Total comments:    {total_comments}\n")
-
-            logging.info(f" By source:")
+            # Display stats, built up and logged as a single record
+            lines = [
+                f"\n{'='*70}",
+                " DATABASE STATUS",
+                f"{'='*70}",
+                f"\n Total obituaries:  {total_obits}",
+                f" Total comments:    {total_comments}\n",
+                " By source:",
+            ]
             for source, count in by_source:
-                logging.info(f"   • {source}: {count}")
+                lines.append(f"   • {source}: {count}")
 
             if recent:
-                logging.info(f"\n Most recent obituaries:")
+                lines.append("\n Most recent obituaries:")
                 for name, source, updated in recent:
-                    logging.info(f"   • {name} ({source})")
-                    logging.info(f"     Updated: {updated}")
+                    lines.append(f"   • {name} ({source})")
+                    lines.append(f"     Updated: {updated}")
 
             if last_runs:
-                logging.info(f"\n Last scraper runs:")
+                lines.append("\n Last scraper runs:")
                 for source, run_time, status in last_runs:
                     status_icon = "✅" if status == "success" else "❌"
-                    logging.info(f"   {status_icon} {source}: {run_time}")
+                    lines.append(f"   {status_icon} {source}: {run_time}")
 
-            logging.info(f"{'='*70}\n")
+            lines.append(f"{'='*70}\n")
+            logging.info("\n".join(lines))
 
         except Exception as e:
             logging.info(f"❌ Error checking database: {str(e)}")
@@ -228,7 +299,7 @@ def main():
     master = MasterScraper()
 
     # Build list of all valid scraper commands
-    core_scrapers = ['steeles', 'benjamins', 'paperman', 'misaskim']
+    core_scrapers = list(CORE_SCRAPER_REGISTRY)
     expansion_scrapers = list(EXPANSION_SCRAPER_REGISTRY.keys())
     all_scraper_names = core_scrapers + expansion_scrapers
 
@@ -108,8 +108,10 @@ def _name_from_slug(slug):
     return name
 
 
-def scrape_listings_page(url):
+def scrape_listings_page(url, session=None):
     """Scrape a single page of shiva listings.
+    session: a requests.Session to fetch with, so consecutive pages reuse one
+    keep-alive connection; a one-off request is made without it.
 
     Uses two strategies:
     1. Parse <a> tags with /shiva-listings/ hrefs (primary)
@@ -117,7 +119,7 @@ def scrape_listings_page(url):
        that may appear in inline scripts, data attributes, or pre-rendered HTML blocks)
     """
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
+        response = (session or requests).get(url, headers=HEADERS, timeout=30)
         response.raise_for_status()
     except requests.RequestException as e:
         print(f"  ERROR fetching {url}: {e}")
@@ -264,14 +266,17 @@ def scrape_all_listings(max_pages=5):
     url = BASE_URL
     page = 1
 
-    while url and page <= max_pages:
-        print(f"  Scraping page {page}: {url}")
-        listings, next_page = scrape_listings_page(url)
-        all_listings.extend(listings)
-        print(f"    Found {len(listings)} listings")
-
-        url = next_page
-        page += 1
+    # Every page is on misaskim.ca: one session keeps the TLS connection alive
+    # between them instead of a fresh handshake per page
+    with requests.Session() as session:
+        while url and page <= max_pages:
+            print(f"  Scraping page {page}: {url}")
+            listings, next_page = scrape_listings_page(url, session)
+            all_listings.extend(listings)
+            print(f"    Found {len(listings)} listings")
+
+            url = next_page
+            page += 1
 
     # Final dedup
     seen = set()
@@ -5,78 +5,139 @@ Paperman & Sons Funeral Home Scraper
 Extracts obituary data from paperman.com (Montreal)
 """
 
+import functools
 import requests
 from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
 import time
 import re
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from base_scraper import mount_http_retries
 from database_setup import NeshamaDatabase
 from shiva_parser import extract_shiva_info
 
+# Compiled once at import: clean_text() runs on every text field and
+# extract_death_date() on every obituary body.
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+# Common patterns in Paperman obituaries:
+# "on Monday, February 2, 2026"
+# "on January 11, 2026"
+# "le 13 janvier 2026"
+_DEATH_DATE_RES = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'on\s+(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+'
+    r'((?:January|February|March|April|May|June|July|August|September|October|November|December)'
+    r'\s+\d{1,2},?\s+\d{4})',
+    r'on\s+((?:January|February|March|April|May|June|July|August|September|October|November|December)'
+    r'\s+\d{1,2},?\s+\d{4})',
+    r'le\s+(\d{1,2}\s+(?:janvier|f[eé]vrier|mars|avril|mai|juin|juillet|ao[uû]t|'
+    r'septembre|octobre|novembre|d[eé]cembre)\s+\d{4})',
+)]
+
+# Comment API fetches run on a few worker threads, each with its own session;
+# each worker pauses after its request, so the site sees at most this many
+# requests per REQUEST_DELAY seconds.
+COMMENT_FETCH_WORKERS = 4
+REQUEST_DELAY = 1.5
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_web_funeral_date(web_date):
+    """'2026-02-05 13:00' -> 'Thursday, February 05 at 01:00PM' (unparseable input is returned as is)"""
+    # Cached: the same active funerals are listed again on every scheduled run
+    try:
+        dt = datetime.strptime(web_date, '%Y-%m-%d %H:%M')
+        return dt.strftime('%A, %B %d at %I:%M%p')
+    except ValueError:
+        return web_date
+
 
 class PapermanScraper:
     def __init__(self):
         self.source_name = "Paperman & Sons"
         self.base_url = "https://www.paperman.com"
         self.image_base_url = "https://ymhbzpyciewmkvghgtpg.supabase.co/storage/v1/object/public/client-images"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
+        # requests.Session isn't thread-safe, so each thread that fetches
+        # (this one and every comment worker) gets its own; see _get_session
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+        self.session = self._get_session()
         self.db = NeshamaDatabase()
 
-    def fetch_page(self, url, retries=3):
-        """Fetch page with retry logic"""
-        for attempt in range(retries):
-            try:
-                response = self.session.get(url, timeout=15)
-                response.raise_for_status()
-                return response.text
-            except requests.exceptions.RequestException as e:
-                if attempt == retries - 1:
-                    raise
-                time.sleep(2 ** attempt)
-        return None
-
-    def fetch_json(self, url, retries=3):
-        """Fetch JSON endpoint with retry logic"""
-        for attempt in range(retries):
-            try:
-                response = self.session.get(url, timeout=15)
-                response.raise_for_status()
-                return response.json()
-            except requests.exceptions.RequestException as e:
-                if attempt == retries - 1:
-                    raise
-                time.sleep(2 ** attempt)
-        return None
+    def _get_session(self):
+        """This thread's session (User-Agent and HTTP_RETRY set), built on first use"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = mount_http_retries(requests.Session())
+            session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            })
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def fetch_page(self, url):
+        """Fetch page; transient failures are retried by the session (HTTP_RETRY)"""
+        response = self._get_session().get(url, timeout=15)
+        response.raise_for_status()
+        return response.text
+
+    def fetch_json(self, url):
+        """Fetch JSON endpoint; transient failures are retried by the session (HTTP_RETRY)"""
+        response = self._get_session().get(url, timeout=15)
+        response.raise_for_status()
+        return response.json()
 
     def clean_text(self, text):
         """Clean and normalize text"""
         if not text:
             return None
-        text = re.sub(r'\s+', ' ', text).strip()
-        text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '[email]', text)
+        # str.split() collapses the same Unicode whitespace as \s+ without a
+        # regex pass, and the email pattern only runs when an '@' is present
+        text = ' '.join(text.split())
+        if '@' in text:
+            text = _EMAIL_RE.sub('[email]', text)
         return text if text else None
 
     def strip_html(self, html_text):
         """Strip HTML tags and return clean text"""
         if not html_text:
             return None
-        soup = BeautifulSoup(html_text, 'html.parser')
-        return self.clean_text(soup.get_text())
+        # Plain-text values (most shiva notes) have nothing for a parser to
+        # do: no tags, no entities, and no NULs for it to replace
+        if '<' not in html_text and '&' not in html_text and '\x00' not in html_text:
+            return self.clean_text(html_text)
+        # lxml's C parser, and only its text: no soup tree is needed just to
+        # read the text back out. Script/style bodies are dropped as get_text()
+        # does; anything lxml rejects falls back to BeautifulSoup.
+        try:
+            root = lxml.html.fragment_fromstring(html_text, create_parent='div')
+        except (lxml.etree.ParserError, ValueError):
+            return self.clean_text(BeautifulSoup(html_text, 'html.parser').get_text())
+        for element in list(root.iter('script', 'style', 'template')):
+            element.drop_tree()
+        return self.clean_text(root.text_content())
 
     def extract_obituary_listings(self, html):
         """Extract all funeral listings from the funerals page __NEXT_DATA__"""
         # The Paperman site is a Next.js app; funeral data is embedded as
         # JSON inside a <script id="__NEXT_DATA__"> tag on the /funerals page.
-        match = re.search(r'__NEXT_DATA__[^>]+>(.*?)</script>', html, re.DOTALL)
-        if not match:
+        # Sliced out with str.find rather than a regex or a full parse of the
+        # page: only the one tag is wanted.
+        marker = html.find('__NEXT_DATA__')
+        start = html.find('>', marker) + 1 if marker != -1 else 0
+        end = html.find('</script>', start) if start else -1
+        if end == -1:
             return []
 
         try:
-            data = json.loads(match.group(1))
+            data = json.loads(html[start:end])
             funerals = data.get('props', {}).get('pageProps', {}).get('activeFunerals', [])
             return funerals
         except (json.JSONDecodeError, KeyError) as e:
@@ -99,11 +160,7 @@ class PapermanScraper:
         # Fall back to web_funeral_date (e.g. "2026-02-05 13:00")
         web_date = funeral_data.get('web_funeral_date')
         if web_date:
-            try:
-                dt = datetime.strptime(web_date, '%Y-%m-%d %H:%M')
-                return dt.strftime('%A, %B %d at %I:%M%p')
-            except ValueError:
-                return web_date
+            return _format_web_funeral_date(web_date)
 
         return None
 
@@ -112,21 +169,8 @@ class PapermanScraper:
         if not obituary_text:
             return None
 
-        # Common patterns in Paperman obituaries:
-        # "on Monday, February 2, 2026"
-        # "on January 11, 2026"
-        # "le 13 janvier 2026"
-        patterns = [
-            r'on\s+(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+'
-            r'((?:January|February|March|April|May|June|July|August|September|October|November|December)'
-            r'\s+\d{1,2},?\s+\d{4})',
-            r'on\s+((?:January|February|March|April|May|June|July|August|September|October|November|December)'
-            r'\s+\d{1,2},?\s+\d{4})',
-            r'le\s+(\d{1,2}\s+(?:janvier|f[eé]vrier|mars|avril|mai|juin|juillet|ao[uû]t|'
-            r'septembre|octobre|novembre|d[eé]cembre)\s+\d{4})',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, obituary_text, re.IGNORECASE)
+        for pattern in _DEATH_DATE_RES:
+            match = pattern.search(obituary_text)
             if match:
                 return match.group(1).strip()
 
@@ -283,6 +327,14 @@ class PapermanScraper:
             logging.info(f"Error extracting comments for funeral {funeral_id}: {str(e)}")
             return []
 
+    def _fetch_comments_politely(self, funeral_id):
+        """extract_comments(), then hold this worker for REQUEST_DELAY"""
+        try:
+            return self.extract_comments(funeral_id)
+        finally:
+            # Be polite - delay between requests
+            time.sleep(REQUEST_DELAY)
+
     def run(self):
         """Execute full scraping process"""
         start_time = time.time()
@@ -308,8 +360,10 @@ class PapermanScraper:
             stats['found'] = len(funeral_listings)
             logging.info(f"Found {stats['found']} obituary listings\n")
 
-            # Process each funeral listing (deduplicate by id)
+            # Process each funeral listing (deduplicate by id). Listings come
+            # from the page already fetched, so no request is made here.
             seen_ids = set()
+            parsed = []
             for i, funeral_data in enumerate(funeral_listings, 1):
                 try:
                     dedup_key = funeral_data.get('id') or funeral_data.get('slug', '')
@@ -317,7 +371,6 @@ class PapermanScraper:
                         continue
                     seen_ids.add(dedup_key)
                     display_name = funeral_data.get('name', 'Unknown')
-                    funeral_id = funeral_data.get('id')
                     logging.info(f"[{i}/{stats['found']}] Processing: {display_name}...")
 
                     # Parse obituary data from the listing JSON
@@ -327,37 +380,56 @@ class PapermanScraper:
                         stats['errors'] += 1
                         continue
 
-                    # Save to database
-                    obit_id, action = self.db.upsert_obituary(obit_data)
-
-                    if action == 'inserted':
-                        stats['new'] += 1
-                        logging.info(f"  + New: {obit_data['deceased_name']}")
-                    elif action == 'updated':
-                        stats['updated'] += 1
-                        logging.info(f"  ~ Updated: {obit_data['deceased_name']}")
-                    else:
-                        logging.info(f"  = Unchanged: {obit_data['deceased_name']}")
-
-                    # Extract and save comments via the API
-                    if funeral_id and funeral_data.get('enable_web_comments', False):
-                        comments = self.extract_comments(funeral_id)
-                        new_comments = 0
-                        for comment in comments:
-                            comment_id = self.db.upsert_comment(obit_id, comment)
-                            if comment_id:
-                                new_comments += 1
-
-                        if new_comments > 0:
-                            logging.info(f"  >> Added {new_comments} new comments")
-
-                    # Be polite - delay between requests
-                    time.sleep(1.5)
+                    parsed.append((funeral_data, obit_data))
 
                 except Exception as e:
                     logging.info(f"  !! Error: {str(e)}")
                     stats['errors'] += 1
 
+            # Save to database: every listing in one transaction; a listing
+            # that fails to save is rolled back alone and counted as an error
+            results = self.db.upsert_obituaries(obit_data for _, obit_data in parsed)
+
+            comment_jobs = []
+            for (funeral_data, obit_data), (obit_id, action) in zip(parsed, results):
+                if action == 'error':
+                    stats['errors'] += 1
+                    logging.info(f"  !! Error saving: {obit_data.get('deceased_name', 'Unknown')}")
+                    continue
+                elif action == 'inserted':
+                    stats['new'] += 1
+                    logging.info(f"  + New: {obit_data['deceased_name']}")
+                elif action == 'updated':
+                    stats['updated'] += 1
+                    logging.info(f"  ~ Updated: {obit_data['deceased_name']}")
+                else:
+                    logging.info(f"  = Unchanged: {obit_data['deceased_name']}")
+
+                funeral_id = funeral_data.get('id')
+                if funeral_id and funeral_data.get('enable_web_comments', False):
+                    comment_jobs.append((obit_id, funeral_id, funeral_data.get('name', 'Unknown')))
+
+            # Extract comments via the API concurrently; they are saved here
+            # on the calling thread, which owns the database connection
+            if comment_jobs:
+                with ThreadPoolExecutor(max_workers=COMMENT_FETCH_WORKERS) as executor:
+                    futures = {
+                        executor.submit(self._fetch_comments_politely, funeral_id): (obit_id, display_name)
+                        for obit_id, funeral_id, display_name in comment_jobs
+                    }
+                    for future in as_completed(futures):
+                        obit_id, display_name = futures[future]
+                        try:
+                            # One transaction per obituary's comments
+                            new_comments = self.db.upsert_comments(obit_id, future.result())
+
+                            if new_comments > 0:
+                                logging.info(f"  >> Added {new_comments} new comments for {display_name}")
+
+                        except Exception as e:
+                            logging.info(f"  !! Error saving comments for {display_name}: {str(e)}")
+                            stats['errors'] += 1
+
             # Log completion
             duration = time.time() - start_time
             self.db.log_scraper_run(
@@ -391,11 +463,15 @@ class PapermanScraper:
             raise
 
         finally:
-            # Release the HTTP connection pool deterministically.
-            try:
-                self.session.close()
-            except Exception:
-                pass
+            # Release the HTTP connection pools deterministically, the
+            # comment workers' included; the workers' sessions are dropped.
+            with self._sessions_lock:
+                sessions, self._sessions = self._sessions, [self.session]
+            for session in sessions:
+                try:
+                    session.close()
+                except Exception:
+                    pass
 
 
 if __name__ == '__main__':
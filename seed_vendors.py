@@ -43,12 +43,17 @@ VENDORS_TO_REMOVE = [
 ]
 
 
+_SLUG_STRIP_RE = re.compile(r'[^a-z0-9\s-]')
+_SLUG_SPACE_RE = re.compile(r'\s+')
+_SLUG_DASH_RE = re.compile(r'-+')
+
+
 def slugify(name):
     """Convert vendor name to URL slug"""
     slug = name.lower().strip()
-    slug = re.sub(r'[^a-z0-9\s-]', '', slug)
-    slug = re.sub(r'[\s]+', '-', slug)
-    slug = re.sub(r'-+', '-', slug)
+    slug = _SLUG_STRIP_RE.sub('', slug)
+    slug = _SLUG_SPACE_RE.sub('-', slug)
+    slug = _SLUG_DASH_RE.sub('-', slug)
     return slug.strip('-')
 
 
@@ -107,47 +112,20 @@ def create_tables(conn):
         CREATE INDEX IF NOT EXISTS idx_leads_vendor ON vendor_leads(vendor_id)
     ''')
 
-    # Migration: add vendor_type column if missing
-    try:
-        cursor.execute('SELECT vendor_type FROM vendors LIMIT 1')
-    except Exception:
-        cursor.execute("ALTER TABLE vendors ADD COLUMN vendor_type TEXT DEFAULT 'food'")
-
-    # Migration: add delivery_area column if missing
-    try:
-        cursor.execute('SELECT delivery_area FROM vendors LIMIT 1')
-    except Exception:
-        cursor.execute("ALTER TABLE vendors ADD COLUMN delivery_area TEXT")
-
-    # Migration: add email column if missing
-    try:
-        cursor.execute('SELECT email FROM vendors LIMIT 1')
-    except Exception:
-        cursor.execute("ALTER TABLE vendors ADD COLUMN email TEXT")
-
-    # Migration: add instagram column if missing
-    try:
-        cursor.execute('SELECT instagram FROM vendors LIMIT 1')
-    except Exception:
-        cursor.execute("ALTER TABLE vendors ADD COLUMN instagram TEXT")
-
-    # Migration: add city column if missing
-    try:
-        cursor.execute('SELECT city FROM vendors LIMIT 1')
-    except Exception:
-        cursor.execute("ALTER TABLE vendors ADD COLUMN city TEXT")
-
-    # Migration: add min_order column if missing (e.g. "$300 minimum")
-    try:
-        cursor.execute('SELECT min_order FROM vendors LIMIT 1')
-    except Exception:
-        cursor.execute("ALTER TABLE vendors ADD COLUMN min_order TEXT")
-
-    # Migration: add lead_time column if missing (e.g. "48 hours notice")
-    try:
-        cursor.execute('SELECT lead_time FROM vendors LIMIT 1')
-    except Exception:
-        cursor.execute("ALTER TABLE vendors ADD COLUMN lead_time TEXT")
+    # Migrations: add columns missing from older databases (one schema read
+    # instead of a failing SELECT per column)
+    vendor_columns = {row[1] for row in cursor.execute('PRAGMA table_info(vendors)')}
+    for column, definition in (
+        ('vendor_type', "TEXT DEFAULT 'food'"),
+        ('delivery_area', 'TEXT'),
+        ('email', 'TEXT'),
+        ('instagram', 'TEXT'),
+        ('city', 'TEXT'),
+        ('min_order', 'TEXT'),  # e.g. "$300 minimum"
+        ('lead_time', 'TEXT'),  # e.g. "48 hours notice"
+    ):
+        if column not in vendor_columns:
+            cursor.execute(f"ALTER TABLE vendors ADD COLUMN {column} {definition}")
 
     # Create vendor_clicks table for click tracking
     cursor.execute('''
@@ -2272,92 +2250,75 @@ def seed_vendors(db_path=None):
     """Seed the vendors table with food and gift vendor data"""
     path = db_path or DB_PATH
     conn = sqlite3.connect(path)
+    # Per-connection settings, as in NeshamaDatabase.connect(). journal_mode is
+    # left alone: it is a property of the file, and the API server sets it
+    # (DELETE during lock recovery, then WAL) around this seed.
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
     create_tables(conn)
 
     cursor = conn.cursor()
     now = datetime.now().isoformat()
-    inserted = 0
     skipped = 0
 
-    # Seed food vendors (Toronto + Montreal)
-    all_food_vendors = VENDORS + MONTREAL_VENDORS
-    for v in all_food_vendors:
-        # RULE: Every vendor must have a website or instagram for tracking
-        if not v.get('website', '').strip() and not v.get('instagram', '').strip():
-            print(f"  SKIPPED (no website or instagram): {v['name']}")
-            skipped += 1
-            continue
-
-        slug = slugify(v['name'])
-        # Check if already exists
-        cursor.execute('SELECT id FROM vendors WHERE slug = ?', (slug,))
-        if cursor.fetchone():
-            skipped += 1
-            continue
-
-        vendor_type = v.get('vendor_type', 'food')
-        cursor.execute('''
-            INSERT INTO vendors (name, slug, category, vendor_type, description, address, neighborhood,
-                                 phone, website, instagram, kosher_status, delivery, delivery_area, image_url, featured, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            v['name'],
-            slug,
-            v['category'],
-            vendor_type,
-            v.get('description', ''),
-            v.get('address', ''),
-            v.get('neighborhood', ''),
-            v.get('phone', ''),
-            v.get('website', ''),
-            v.get('instagram', ''),
-            v.get('kosher_status', 'not_certified'),
-            v.get('delivery', 0),
-            v.get('delivery_area', ''),
-            v.get('image_url'),
-            v.get('featured', 0),
-            now,
-        ))
-        inserted += 1
-
-    # Seed gift vendors
-    gift_inserted = 0
-    for v in GIFT_VENDORS:
-        # RULE: Every vendor must have a website or instagram for tracking
-        if not v.get('website', '').strip() and not v.get('instagram', '').strip():
-            print(f"  SKIPPED (no website or instagram): {v['name']}")
-            skipped += 1
-            continue
-
-        slug = slugify(v['name'])
-        cursor.execute('SELECT id FROM vendors WHERE slug = ?', (slug,))
-        if cursor.fetchone():
-            skipped += 1
-            continue
-
-        cursor.execute('''
-            INSERT INTO vendors (name, slug, category, vendor_type, description, address, neighborhood,
-                                 phone, website, instagram, kosher_status, delivery, delivery_area, image_url, featured, created_at)
-            VALUES (?, ?, ?, 'gift', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            v['name'],
-            slug,
-            v['category'],
-            v.get('description', ''),
-            v.get('address', ''),
-            v.get('neighborhood', ''),
-            v.get('phone', ''),
-            v.get('website', ''),
-            v.get('instagram', ''),
-            v.get('kosher_status', 'not_certified'),
-            v.get('delivery', 0),
-            v.get('delivery_area', ''),
-            v.get('image_url'),
-            v.get('featured', 0),
-            now,
-        ))
-        gift_inserted += 1
-        inserted += 1
+    # Every slug already in the table, in one query (it is read off the slug
+    # index); slugs queued in this run are added as they go. Closed vendors
+    # are never queued: they would only be deleted again below, so a reseed
+    # of an up-to-date table writes nothing.
+    existing = {row[0] for row in cursor.execute('SELECT slug FROM vendors')}
+    retired = {slugify(name) for name in VENDORS_TO_REMOVE}
+
+    # Collect the new rows, then insert them with one executemany()
+    # (a single prepared statement).
+
+    def new_vendor_rows(vendors, vendor_type=None):
+        nonlocal skipped
+        for v in vendors:
+            # RULE: Every vendor must have a website or instagram for tracking
+            if not v.get('website', '').strip() and not v.get('instagram', '').strip():
+                print(f"  SKIPPED (no website or instagram): {v['name']}")
+                skipped += 1
+                continue
+
+            slug = slugify(v['name'])
+            # Check if already exists
+            if slug in existing or slug in retired:
+                skipped += 1
+                continue
+            existing.add(slug)
+
+            yield (
+                v['name'],
+                slug,
+                v['category'],
+                vendor_type or v.get('vendor_type', 'food'),
+                v.get('description', ''),
+                v.get('address', ''),
+                v.get('neighborhood', ''),
+                v.get('phone', ''),
+                v.get('website', ''),
+                v.get('instagram', ''),
+                v.get('kosher_status', 'not_certified'),
+                v.get('delivery', 0),
+                v.get('delivery_area', ''),
+                v.get('image_url'),
+                v.get('featured', 0),
+                now,
+            )
+
+    insert_sql = '''
+        INSERT INTO vendors (name, slug, category, vendor_type, description, address, neighborhood,
+                             phone, website, instagram, kosher_status, delivery, delivery_area, image_url, featured, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    # Food vendors (Toronto + Montreal), then gift vendors, in one batch
+    food_rows = list(new_vendor_rows(VENDORS + MONTREAL_VENDORS))
+    gift_rows = list(new_vendor_rows(GIFT_VENDORS, vendor_type='gift'))
+    cursor.executemany(insert_sql, food_rows + gift_rows)
+
+    gift_inserted = len(gift_rows)
+    inserted = len(food_rows) + gift_inserted
 
     # Remove closed/defunct vendors
     removed = 0
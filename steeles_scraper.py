@@ -10,6 +10,7 @@ from bs4 import BeautifulSoup
 import time
 import re
 from datetime import datetime
+from base_scraper import mount_http_retries
 from database_setup import NeshamaDatabase
 from shiva_parser import extract_shiva_info
 
@@ -25,24 +26,17 @@ class SteelesScraper:
     def __init__(self):
         self.source_name = "Steeles Memorial Chapel"
         self.base_url = "https://steelesmemorialchapel.com"
-        self.session = requests.Session()
+        self.session = mount_http_retries(requests.Session())
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
         self.db = NeshamaDatabase()
 
-    def fetch_page(self, url, retries=3):
-        """Fetch page with retry logic"""
-        for attempt in range(retries):
-            try:
-                response = self.session.get(url, timeout=15)
-                response.raise_for_status()
-                return response.text
-            except requests.exceptions.RequestException as e:
-                if attempt == retries - 1:
-                    raise
-                time.sleep(2 ** attempt)  # Exponential backoff
-        return None
+    def fetch_page(self, url):
+        """Fetch page; transient failures are retried by the session (HTTP_RETRY)"""
+        response = self.session.get(url, timeout=15)
+        response.raise_for_status()
+        return response.text
 
     def extract_obituary_links(self, html):
         """Extract all condolence page links"""
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Tests for master_scraper.MasterScraper: run_all_scrapers(), the scraper
+registry and check_database_status().
+
+Network-free: the real scrapers are swapped for fakes that return canned
+stats instead of fetching, so the tests only exercise scheduling and stats
+aggregation.
+Database status runs against a temporary SQLite database.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import master_scraper
+from master_scraper import MasterScraper
+from database_setup import NeshamaDatabase
+
+
+class _FakeScraper:
+    def __init__(self, stats=None, barrier=None, error=None):
+        self.stats = stats or {'found': 1, 'new': 1, 'updated': 0}
+        self.barrier = barrier
+        self.error = error
+        self.thread = None
+
+    def run(self):
+        self.thread = threading.current_thread()
+        if self.barrier:
+            self.barrier.wait()  # only passes once every fake is running at once
+        if self.error:
+            raise self.error
+        return self.stats
+
+
+class TestRunAllScrapers(unittest.TestCase):
+
+    def setUp(self):
+        self.master = MasterScraper()
+        # No city_config expansion scrapers in these tests
+        patcher = patch.object(master_scraper, 'EXPANSION_SCRAPER_REGISTRY', {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_scrapers_run_concurrently(self):
+        barrier = threading.Barrier(4, timeout=5)
+        fakes = [_FakeScraper(barrier=barrier) for _ in range(4)]
+        self.master.scrapers = [(f'S{i}', fake) for i, fake in enumerate(fakes)]
+
+        with patch.dict(os.environ):
+            os.environ.pop('NESHAMA_SCRAPER_PARALLEL', None)
+            stats = self.master.run_all_scrapers()
+
+        self.assertEqual(stats['scrapers_succeeded'], 4)
+        self.assertEqual(stats['total_found'], 4)
+        self.assertEqual(len({fake.thread for fake in fakes}), 4)
+
+    def test_failure_counted_and_others_still_aggregated(self):
+        self.master.scrapers = [
+            ('Good', _FakeScraper({'found': 5, 'new': 2, 'updated': 1})),
+            ('Bad', _FakeScraper(error=RuntimeError('site down'))),
+            ('Other', _FakeScraper({'found': 3, 'new': 0, 'updated': 3})),
+        ]
+
+        stats = self.master.run_all_scrapers()
+
+        self.assertEqual(stats, {
+            'scrapers_run': 3,
+            'scrapers_succeeded': 2,
+            'scrapers_failed': 1,
+            'total_found': 8,
+            'total_new': 2,
+            'total_updated': 4,
+        })
+
+    def test_parallel_one_runs_on_calling_thread(self):
+        fakes = [_FakeScraper() for _ in range(3)]
+        self.master.scrapers = [(f'S{i}', fake) for i, fake in enumerate(fakes)]
+
+        with patch.dict(os.environ, {'NESHAMA_SCRAPER_PARALLEL': '1'}):
+            stats = self.master.run_all_scrapers()
+
+        self.assertEqual(stats['scrapers_succeeded'], 3)
+        for fake in fakes:
+            self.assertIs(fake.thread, threading.current_thread())
+
+
+class TestScraperRegistry(unittest.TestCase):
+
+    def test_single_scraper_builds_only_that_scraper(self):
+        built = []
+
+        def fake_load(spec):
+            def build():
+                built.append(spec.partition(':')[0])
+                return _FakeScraper({'found': 2})
+            return build
+
+        with patch.object(master_scraper, '_load_scraper_class', side_effect=fake_load):
+            master = MasterScraper()
+            self.assertEqual(built, [])
+            stats = master.run_single_scraper('benjamins')
+            self.assertEqual(stats['found'], 2)
+            self.assertEqual(built, ['benjamins_scraper'])
+            master.run_single_scraper('Pap')
+            self.assertEqual(built, ['benjamins_scraper', 'paperman_scraper'])
+            with self.assertLogs(level='INFO'):
+                self.assertIsNone(master.run_single_scraper('nope'))
+
+            self.assertEqual([name for name, _ in master.scrapers],
+                             ['Steeles', "Benjamin's", 'Paperman', 'Misaskim'])
+            self.assertIs(master.scrapers, master.scrapers)
+
+    def test_expansion_scraper_with_missing_dependency_is_unavailable(self):
+        def fake_load(spec):
+            raise ImportError("No module named 'cloudscraper'")
+
+        with patch.dict(master_scraper.EXPANSION_SCRAPER_REGISTRY,
+                        {'dignity_memorial': 'dignity_memorial_scraper:DignityMemorialScraper'}), \
+                patch.object(master_scraper, '_load_scraper_class', side_effect=fake_load):
+            with self.assertLogs(level='INFO') as logs:
+                self.assertIsNone(MasterScraper().run_single_scraper('dignity_memorial'))
+        self.assertIn('not available', logs.output[0])
+
+    def test_registry_specs_resolve_to_scraper_classes(self):
+        for _name, spec in master_scraper.CORE_SCRAPER_REGISTRY.values():
+            cls = master_scraper._load_scraper_class(spec)
+            self.assertEqual(cls.__name__, spec.partition(':')[2])
+            self.assertTrue(callable(getattr(cls, 'run', None)))
+
+
+class TestDatabaseStatus(unittest.TestCase):
+
+    def setUp(self):
+        self.db_fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        NeshamaDatabase(self.db_path).create_tables()
+        self.master = MasterScraper()
+        self.master.db = NeshamaDatabase(self.db_path)
+
+    def tearDown(self):
+        os.close(self.db_fd)
+        os.unlink(self.db_path)
+
+    def _status_lines(self):
+        with self.assertLogs(level='INFO') as logs:
+            self.master.check_database_status()
+        self.assertEqual(len(logs.records), 1)  # one record for the whole report
+        return logs.records[0].getMessage().split('\n')
+
+    def test_counts_by_source_and_comments(self):
+        conn = sqlite3.connect(self.db_path)
+        for obit_id, source in (('a', 'Steeles'), ('b', 'Steeles'), ('c', 'Paperman')):
+            conn.execute('''
+                INSERT INTO obituaries (id, source, source_url, deceased_name, scraped_at,
+                                        first_seen, last_updated, content_hash)
+                VALUES (?, ?, 'u', ?, 't', 't', 't', 'h')
+            ''', (obit_id, source, f'Person {obit_id}'))
+        conn.execute('''
+            INSERT INTO comments (obituary_id, commenter_name, comment_text, scraped_at)
+            VALUES ('a', 'X', 'Condolences', 't')
+        ''')
+        conn.commit()
+        conn.close()
+
+        lines = self._status_lines()
+
+        self.assertIn(' Total obituaries:  3', lines)
+        self.assertIn(' Total comments:    1', lines)
+        self.assertIn('   • Steeles: 2', lines)
+        self.assertIn('   • Paperman: 1', lines)
+
+    def test_status_connection_is_read_only(self):
+        db = NeshamaDatabase(self.db_path)
+        db.connect_readonly()
+        try:
+            self.assertEqual(db.cursor.execute('SELECT COUNT(*) FROM obituaries').fetchone()[0], 0)
+            with self.assertRaises(sqlite3.OperationalError):
+                db.cursor.execute("INSERT INTO scraper_log (source, run_time, status) VALUES ('x', 't', 'ok')")
+        finally:
+            db.close()
+
+    def test_latest_rows_read_from_index(self):
+        conn = sqlite3.connect(self.db_path)
+        for table, column in (('obituaries', 'last_updated'), ('scraper_log', 'run_time')):
+            plan = ' '.join(row[3] for row in conn.execute(
+                f'EXPLAIN QUERY PLAN SELECT * FROM {table} ORDER BY {column} DESC LIMIT 5'))
+            self.assertIn('USING INDEX', plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+        conn.close()
+
+    def test_empty_database(self):
+        lines = self._status_lines()
+        self.assertIn(' Total obituaries:  0', lines)
+        self.assertIn(' Total comments:    0', lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
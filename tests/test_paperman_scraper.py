@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Tests for paperman_scraper.PapermanScraper.
+
+Network-free: the text/HTML helpers run on an instance built without __init__,
+and run() against a temporary SQLite database with the page and comment API
+fetches replaced by fakes.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import paperman_scraper
+from paperman_scraper import PapermanScraper
+from database_setup import NeshamaDatabase
+
+
+def _scraper():
+    return PapermanScraper.__new__(PapermanScraper)
+
+
+class TestStripHtml(unittest.TestCase):
+
+    def setUp(self):
+        self.scraper = _scraper()
+
+    def _soup_text(self, html_text):
+        return self.scraper.clean_text(BeautifulSoup(html_text, 'html.parser').get_text())
+
+    def test_matches_beautifulsoup_text(self):
+        samples = [
+            '<p>Beloved wife of <b>David</b> &amp; mother of Ruth.</p>',
+            '<p>a</p>\n<p>b</p>',
+            'plain & text < 3',
+            '<p>unclosed <i>italic',
+            '&nbsp;Sarah&rsquo;s family, z"l',
+            '<p>שלום</p>',
+            '<ul><li>Shiva at 12 Main St.</li><li>Contact: someone@example.com</li></ul>',
+            '<html><body><p>full document</p></body></html>',
+            'Shiva at the family home,\r\n Monday to Thursday',
+            'Tom; Dick # Harry\x0b\x85',
+        ]
+        for html_text in samples:
+            self.assertEqual(self.scraper.strip_html(html_text), self._soup_text(html_text), html_text)
+
+    def test_script_and_style_bodies_dropped(self):
+        self.assertEqual(self.scraper.strip_html('<style>p{}</style><div><script>var x=1</script>Text</div>'),
+                         'Text')
+
+    def test_empty_input(self):
+        for html_text in (None, '', '   ', '<p></p>'):
+            self.assertIsNone(self.scraper.strip_html(html_text))
+
+
+class TestTextPatterns(unittest.TestCase):
+
+    def setUp(self):
+        self.scraper = _scraper()
+
+    def test_clean_text_masks_email(self):
+        self.assertEqual(self.scraper.clean_text('  Write to\n family@example.ca  '),
+                         'Write to [email]')
+        self.assertEqual(self.scraper.clean_text('Ruth\xa0\u2003and\t\tSam '), 'Ruth and Sam')
+        self.assertIsNone(self.scraper.clean_text(' \n\xa0'))
+        # '|' is not a TLD character
+        self.assertEqual(self.scraper.clean_text('a@b.c|om'), 'a@b.c|om')
+
+    def test_extract_death_date(self):
+        cases = {
+            'passed away on Monday, February 2, 2026 surrounded by family': 'February 2, 2026',
+            'died peacefully ON january 11 2026': 'january 11 2026',
+            'décédée le 13 février 2026 à Montréal': '13 février 2026',
+            'no date here': None,
+        }
+        for text, expected in cases.items():
+            self.assertEqual(self.scraper.extract_death_date(text), expected, text)
+
+    def test_extract_obituary_listings(self):
+        page = ('<script id="__NEXT_DATA__" type="application/json">'
+                '{"props": {"pageProps": {"activeFunerals": [{"id": 1}]}}}</script>')
+        self.assertEqual(self.scraper.extract_obituary_listings(page), [{'id': 1}])
+        self.assertEqual(self.scraper.extract_obituary_listings('<html></html>'), [])
+        self.assertEqual(self.scraper.extract_obituary_listings(page[:-len('</script>')]), [])
+        self.assertEqual(self.scraper.extract_obituary_listings('<p>__NEXT_DATA__'), [])
+
+    def test_parse_funeral_date(self):
+        self.assertEqual(self.scraper.parse_funeral_date({'email_funeral_date': 'Thursday, February 5 at 1:00PM',
+                                                          'web_funeral_date': '2026-02-05 13:00'}),
+                         'Thursday, February 5 at 1:00PM')
+        for _ in range(2):  # second call is served from the cache
+            self.assertEqual(self.scraper.parse_funeral_date({'web_funeral_date': '2026-02-05 13:00'}),
+                             'Thursday, February 05 at 01:00PM')
+        self.assertEqual(self.scraper.parse_funeral_date({'web_funeral_date': 'TBA'}), 'TBA')
+        self.assertIsNone(self.scraper.parse_funeral_date({}))
+
+
+class TestRunComments(unittest.TestCase):
+
+    def setUp(self):
+        self.db_fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        NeshamaDatabase(self.db_path).create_tables()
+        self.scraper = PapermanScraper()
+        self.scraper.db = NeshamaDatabase(self.db_path)
+        funerals = [
+            {'id': n, 'name': f'Person {n}', 'slug': f'person-{n}', 'enable_web_comments': n != 4}
+            for n in range(1, 6)
+        ]
+        funerals.append(dict(funerals[0]))  # duplicate listing
+        page = ('<script id="__NEXT_DATA__" type="application/json">'
+                + json.dumps({'props': {'pageProps': {'activeFunerals': funerals}}}) + '</script>')
+        self.scraper.fetch_page = lambda url: page
+
+    def tearDown(self):
+        os.close(self.db_fd)
+        os.unlink(self.db_path)
+
+    def test_comments_fetched_concurrently_and_saved(self):
+        fetched = []
+        threads = set()
+        sessions = set()
+        lock = threading.Lock()
+        two_in_flight = threading.Barrier(2, timeout=5)
+
+        def fake_fetch_json(url):
+            with lock:
+                fetched.append(url.rsplit('=', 1)[1])
+                first_two = len(fetched) <= 2
+                threads.add(threading.current_thread())
+                sessions.add(self.scraper._get_session())
+            if first_two:
+                two_in_flight.wait()  # only passes if two fetches overlap
+            return [{'name': 'Friend', 'text': f'Condolences {url}', 'created_at': '2026-02-03'},
+                    {'text': 'hidden', 'private': True}]
+
+        self.scraper.fetch_json = fake_fetch_json
+        with patch.object(paperman_scraper, 'REQUEST_DELAY', 0):
+            stats = self.scraper.run()
+
+        self.assertEqual(sorted(fetched), ['1', '2', '3', '5'])
+        self.assertNotIn(threading.current_thread(), threads)
+        self.assertGreater(len(threads), 1)
+        # requests.Session isn't thread-safe: one per worker, none shared with run()
+        self.assertEqual(len(sessions), len(threads))
+        self.assertNotIn(self.scraper.session, sessions)
+        self.assertEqual(stats, {'found': 6, 'new': 5, 'updated': 0, 'errors': 0})
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM comments').fetchone()[0], 4)
+        conn.close()
+
+        # A second run finds everything already saved
+        with patch.object(paperman_scraper, 'REQUEST_DELAY', 0):
+            stats = self.scraper.run()
+        self.assertEqual(stats, {'found': 6, 'new': 0, 'updated': 0, 'errors': 0})
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM comments').fetchone()[0], 4)
+        conn.close()
+
+    def test_run_counts_unsaveable_listing_as_error(self):
+        upsert_row = NeshamaDatabase._upsert_obituary_row
+
+        def flaky_upsert_row(db, obituary_data):
+            if obituary_data['deceased_name'] == 'Person 2':
+                raise sqlite3.IntegrityError('boom')
+            return upsert_row(db, obituary_data)
+
+        self.scraper.fetch_json = lambda url: []
+        with patch.object(NeshamaDatabase, '_upsert_obituary_row', flaky_upsert_row), \
+                patch.object(paperman_scraper, 'REQUEST_DELAY', 0):
+            stats = self.scraper.run()
+        self.assertEqual(stats, {'found': 6, 'new': 4, 'updated': 0, 'errors': 1})
+
+    def test_batch_upsert_isolates_failing_rows(self):
+        db = NeshamaDatabase(self.db_path)
+        good = {'source': 'Paperman & Sons', 'source_url': 'u', 'condolence_url': 'u', 'deceased_name': 'A'}
+        (obit_id, action), failed = db.upsert_obituaries([good, {'deceased_name': 'B'}])
+        self.assertEqual(action, 'inserted')
+        self.assertEqual(failed, (None, 'error'))
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM obituaries').fetchone()[0], 1)
+        conn.close()
+
+        self.assertEqual(db.upsert_obituaries([dict(good, funeral_datetime='Monday')]), [(obit_id, 'updated')])
+        comment = {'commenter_name': 'Friend', 'posted_at': '2026-02-03'}
+        self.assertEqual(db.upsert_comments(obit_id, [dict(comment, comment_text='x'),
+                                                      dict(comment, comment_text='y')]), 2)
+        self.assertEqual(db.upsert_comments(obit_id, [dict(comment, comment_text='x'),
+                                                      dict(comment, comment_text='z')]), 1)
+        self.assertEqual(db.upsert_comments(obit_id, []), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared scraper HTTP retry policy (base_scraper.HTTP_RETRY).
+
+Runs a throwaway HTTP server on localhost that answers from a scripted list
+of status codes, so no funeral-home site is contacted.
+"""
+
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import base_scraper
+from base_scraper import mount_http_retries
+
+
+class _ScriptedHandler(BaseHTTPRequestHandler):
+    statuses = []
+    hits = 0
+
+    def do_GET(self):
+        cls = type(self)
+        status = cls.statuses[min(cls.hits, len(cls.statuses) - 1)]
+        cls.hits += 1
+        self.send_response(status)
+        if status in (429, 503):
+            self.send_header('Retry-After', '0')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpRetry(unittest.TestCase):
+
+    def setUp(self):
+        _ScriptedHandler.hits = 0
+        self.server = HTTPServer(('127.0.0.1', 0), _ScriptedHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}/'
+        # Keep the tests fast: no backoff sleeps between attempts
+        patcher = patch.object(base_scraper.HTTP_RETRY, 'backoff_factor', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.session = mount_http_retries(requests.Session())
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_transient_errors_retried_until_success(self):
+        _ScriptedHandler.statuses = [503, 429, 200]
+        response = self.session.get(self.url, timeout=5)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(_ScriptedHandler.hits, 3)
+
+    def test_gives_up_after_three_attempts(self):
+        _ScriptedHandler.statuses = [502]
+        response = self.session.get(self.url, timeout=5)
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(_ScriptedHandler.hits, 3)
+        with self.assertRaises(requests.HTTPError):
+            response.raise_for_status()
+
+    def test_permanent_error_not_retried(self):
+        _ScriptedHandler.statuses = [404]
+        self.assertEqual(self.session.get(self.url, timeout=5).status_code, 404)
+        self.assertEqual(_ScriptedHandler.hits, 1)
+
+    def test_existing_adapters_kept(self):
+        session = requests.Session()
+        adapters = dict(session.adapters)
+        mount_http_retries(session)
+        self.assertEqual(dict(session.adapters), adapters)
+        for adapter in session.adapters.values():
+            self.assertIs(adapter.max_retries, base_scraper.HTTP_RETRY)
+        session.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for seed_vendors.seed_vendors() against a temporary SQLite database.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import seed_vendors
+from seed_vendors import seed_vendors as seed, slugify
+
+
+def _has_link(vendor):
+    return bool(vendor.get('website', '').strip() or vendor.get('instagram', '').strip())
+
+
+class TestSeedVendors(unittest.TestCase):
+
+    def setUp(self):
+        self.db_fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(self.db_fd)
+        os.unlink(self.db_path)  # seed_vendors creates the schema itself
+        self.removed = {slugify(name) for name in seed_vendors.VENDORS_TO_REMOVE}
+        self.expected = {
+            slugify(v['name']): v
+            for v in seed_vendors.VENDORS + seed_vendors.MONTREAL_VENDORS + seed_vendors.GIFT_VENDORS
+            if _has_link(v)
+        }
+
+    def tearDown(self):
+        if os.path.exists(self.db_path):
+            os.unlink(self.db_path)
+
+    def _vendors(self):
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute('SELECT slug, name, vendor_type, website, instagram FROM vendors').fetchall()
+        conn.close()
+        return {row[0]: row[1:] for row in rows}
+
+    def test_fresh_seed(self):
+        inserted = seed(self.db_path)
+
+        self.assertEqual(inserted, len(set(self.expected) - self.removed))
+        vendors = self._vendors()
+        self.assertEqual(set(vendors), set(self.expected) - self.removed)
+        for v in seed_vendors.GIFT_VENDORS:
+            slug = slugify(v['name'])
+            if slug in vendors:
+                self.assertEqual(vendors[slug][1], 'gift')
+        for v in seed_vendors.VENDORS + seed_vendors.MONTREAL_VENDORS:
+            slug = slugify(v['name'])
+            if slug in vendors:
+                self.assertEqual(vendors[slug][1], v.get('vendor_type', 'food'))
+                self.assertEqual(vendors[slug][2], v.get('website', ''))
+
+    def test_reseed_keeps_existing_rows(self):
+        seed(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("UPDATE vendors SET description = 'edited'")
+        some_slug = conn.execute('SELECT slug FROM vendors ORDER BY id LIMIT 1').fetchone()[0]
+        conn.execute('DELETE FROM vendors WHERE slug = ?', (some_slug,))
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(seed(self.db_path), 1)
+
+        vendors = self._vendors()
+        self.assertEqual(set(vendors), set(self.expected) - self.removed)
+        conn = sqlite3.connect(self.db_path)
+        descriptions = dict(conn.execute('SELECT slug, description FROM vendors').fetchall())
+        conn.close()
+        self.assertNotEqual(descriptions.pop(some_slug), 'edited')
+        self.assertEqual(set(descriptions.values()), {'edited'})
+
+    def test_up_to_date_reseed_writes_nothing(self):
+        seed(self.db_path)
+        self.assertEqual(seed(self.db_path), 0)
+
+        # AUTOINCREMENT records every id ever handed out, so rows inserted and
+        # then deleted again (closed vendors) would show up here
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'vendors'").fetchone()[0],
+                         len(set(self.expected) - self.removed))
+        conn.close()
+
+    def test_closed_vendor_already_in_table_is_removed(self):
+        seed(self.db_path)
+        closed = seed_vendors.VENDORS_TO_REMOVE[0]
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("INSERT INTO vendors (name, slug, category, created_at) VALUES (?, ?, 'x', 't')",
+                     (closed, slugify(closed)))
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(seed(self.db_path), 0)
+        self.assertNotIn(slugify(closed), self._vendors())
+
+
+if __name__ == '__main__':
+    unittest.main()
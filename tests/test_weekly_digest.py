@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Tests for weekly_digest.WeeklyDigestSender.send_weekly_digest()
+
+Uses a temporary SQLite database and a fake SendGrid client so no real
+API calls are made.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'frontend'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import weekly_digest
+from weekly_digest import WeeklyDigestSender, _html_to_plain
+from database_setup import NeshamaDatabase
+
+
+class _FakeResponse:
+    status_code = 202
+
+
+class _FakeSendGrid:
+    """Records every message handed to send(); thread-safe."""
+    sent = []
+    lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def send(self, message):
+        with self.lock:
+            self.sent.append(message.get())
+        return _FakeResponse()
+
+
+class WeeklyDigestTestBase(unittest.TestCase):
+    """Temp DB seeded with obituaries from Toronto and Montreal homes."""
+
+    def setUp(self):
+        self.db_fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        NeshamaDatabase(self.db_path).create_tables()
+        _FakeSendGrid.sent = []
+        self.sg_patch = patch.object(weekly_digest, 'SendGridAPIClient', _FakeSendGrid)
+        self.sg_patch.start()
+        self.sender = WeeklyDigestSender(self.db_path, sendgrid_api_key='test-key')
+        # Subscribing must not try to send welcome emails
+        self.sender.subscription_manager.sendgrid_api_key = None
+
+    def tearDown(self):
+        self.sender.close()
+        self.sg_patch.stop()
+        os.close(self.db_fd)
+        os.unlink(self.db_path)
+
+    def _add_obit(self, obit_id, source, days_ago=1, hidden=0, name=None):
+        ts = (datetime.now() - timedelta(days=days_ago)).isoformat()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            INSERT INTO obituaries (id, source, source_url, deceased_name, condolence_url,
+                                    scraped_at, first_seen, last_updated, content_hash, hidden)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (obit_id, source, f'https://example.com/{obit_id}', name or f'Person {obit_id}',
+              f'https://example.com/{obit_id}', ts, ts, ts, 'hash', hidden))
+        conn.commit()
+        conn.close()
+
+    def _subscribe(self, email, frequency='weekly', locations='toronto,montreal'):
+        result = self.sender.subscription_manager.subscribe(email, frequency=frequency, locations=locations)
+        self.assertEqual(result['status'], 'success')
+
+    def _last_sent(self, email):
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute('SELECT last_email_sent FROM subscribers WHERE email = ?', (email,)).fetchone()
+        conn.close()
+        return row[0]
+
+    def _recipients(self):
+        return sorted(
+            to['email']
+            for message in _FakeSendGrid.sent
+            for p in message['personalizations']
+            for to in p['to']
+        )
+
+
+class TestWeeklyDigestSend(WeeklyDigestTestBase):
+
+    def test_skips_when_no_obituaries(self):
+        self._subscribe('a@example.com')
+        result = self.sender.send_weekly_digest()
+        self.assertEqual(result['status'], 'skipped')
+        self.assertEqual(_FakeSendGrid.sent, [])
+
+    def test_skips_when_no_weekly_subscribers(self):
+        self._add_obit('t1', 'Steeles Memorial Chapel')
+        self._subscribe('daily@example.com', frequency='daily')
+        result = self.sender.send_weekly_digest()
+        self.assertEqual(result['status'], 'skipped')
+        self.assertEqual(result['reason'], 'no_subscribers')
+        self.assertEqual(_FakeSendGrid.sent, [])
+
+    def test_every_weekly_subscriber_sent_once(self):
+        self._add_obit('t1', 'Steeles Memorial Chapel')
+        self._add_obit('m1', 'Paperman & Sons')
+        emails = [f'weekly{i}@example.com' for i in range(30)]
+        for email in emails:
+            self._subscribe(email)
+        self._subscribe('daily@example.com', frequency='daily')
+
+        with patch.dict(os.environ, {'DIGEST_CONCURRENCY': '4'}):
+            result = self.sender.send_weekly_digest()
+
+        self.assertEqual(result['subscribers_sent'], 30)
+        self.assertEqual(result['subscribers_failed'], 0)
+        self.assertEqual(self._recipients(), sorted(emails))
+        for email in emails:
+            self.assertIsNotNone(self._last_sent(email))
+        self.assertIsNone(self._last_sent('daily@example.com'))
+
+    def test_subscriber_without_matching_obits_is_skipped(self):
+        self._add_obit('t1', 'Steeles Memorial Chapel')
+        self._subscribe('mtl@example.com', locations='montreal')
+        self._subscribe('tor@example.com', locations='toronto')
+
+        result = self.sender.send_weekly_digest()
+
+        self.assertEqual(result['subscribers_sent'], 1)
+        self.assertEqual(result['subscribers_skipped'], 1)
+        self.assertEqual(self._recipients(), ['tor@example.com'])
+        self.assertIsNone(self._last_sent('mtl@example.com'))
+
+    def test_batches_one_request_per_location_group(self):
+        self._add_obit('t1', 'Steeles Memorial Chapel')
+        self._add_obit('m1', 'Paperman & Sons')
+        for i in range(5):
+            self._subscribe(f'both{i}@example.com')
+        for i in range(3):
+            self._subscribe(f'tor{i}@example.com', locations='toronto')
+
+        with patch.object(weekly_digest, 'SENDGRID_BATCH_SIZE', 2):
+            result = self.sender.send_weekly_digest()
+
+        self.assertEqual(result['subscribers_sent'], 8)
+        # ceil(5/2) + ceil(3/2) requests
+        self.assertEqual(len(_FakeSendGrid.sent), 5)
+        for message in _FakeSendGrid.sent:
+            for p in message['personalizations']:
+                self.assertEqual(len(p['to']), 1)
+                token_url = p['substitutions'][weekly_digest.UNSUBSCRIBE_SUBSTITUTION]
+                self.assertTrue(token_url.startswith('https://neshama.ca/unsubscribe/'))
+                self.assertEqual(p['headers']['List-Unsubscribe'], f'<{token_url}>')
+
+    def test_failed_send_not_marked_sent(self):
+        self._add_obit('t1', 'Steeles Memorial Chapel')
+        self._subscribe('a@example.com')
+
+        with patch.object(_FakeSendGrid, 'send', side_effect=RuntimeError('boom')):
+            result = self.sender.send_weekly_digest()
+
+        self.assertEqual(result['subscribers_failed'], 1)
+        self.assertIsNone(self._last_sent('a@example.com'))
+
+    def test_single_send_fills_unsubscribe_in_both_bodies(self):
+        self._add_obit('t1', 'Steeles Memorial Chapel')
+        html, plain = self.sender.generate_weekly_html(self.sender.get_weekly_obituaries())
+        self.assertIn('{{unsubscribe_url}}', plain)
+
+        result = self.sender.send_digest_to_subscriber('a@example.com', 'tok', html, plain, 'toronto')
+
+        self.assertTrue(result['success'])
+        contents = {c['type']: c['value'] for c in _FakeSendGrid.sent[0]['content']}
+        for body in contents.values():
+            self.assertIn('https://neshama.ca/unsubscribe/tok', body)
+            self.assertNotIn('{{unsubscribe_url}}', body)
+
+    def test_connection_shared_until_close(self):
+        self._add_obit('t1', 'Steeles Memorial Chapel')
+        conn = self.sender._get_conn()
+        self.assertEqual(len(self.sender.get_weekly_obituaries()), 1)
+        self.assertIs(self.sender._get_conn(), conn)
+
+        self.sender.close()
+        self.sender.close()  # idempotent
+        self.assertIsNot(self.sender._get_conn(), conn)
+
+    def test_weekly_window_uses_schema_index(self):
+        conn = sqlite3.connect(self.db_path)
+        plan = conn.execute('EXPLAIN QUERY PLAN ' + weekly_digest._WEEKLY_SQL_ALL, ('2026-01-01',)).fetchall()
+        conn.close()
+        self.assertIn('idx_obituary_first_seen_or_updated', plan[0][3])
+
+
+class TestHtmlToPlain(unittest.TestCase):
+
+    def test_tags_links_and_entities(self):
+        html = ('<p>Name &middot; Home</p><p><a href="https://neshama.ca/x" style="c">Read obituary</a></p>'
+                '<tr><td>A</td><td>B</td></tr>Oct 1 &ndash; Oct 7&nbsp;')
+        self.assertEqual(
+            _html_to_plain(html),
+            'Name \u00b7 Home\n\nRead obituary (https://neshama.ca/x)\n\nA B \nOct 1 \u2013 Oct 7',
+        )
+
+    def test_escaped_characters_in_names_are_decoded(self):
+        self.assertEqual(_html_to_plain('<p>Paperman &amp; Sons &#8212; O&#39;Neil &lt;3</p>'),
+                         "Paperman & Sons \u2014 O'Neil <3")
+
+    def test_plain_text_without_markup(self):
+        self.assertEqual(_html_to_plain('  one\n\n\n\ntwo  '), 'one\n\ntwo')
+        self.assertEqual(_html_to_plain('Smith & Sons'), 'Smith & Sons')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Tests for yahrzeit_manager.YahrzeitManager
+
+Covers the subscribe / confirm / unsubscribe lifecycle and the queries the
+daily reminder processor relies on. Uses a temporary SQLite database; no
+SendGrid key is set, so nothing is sent.
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'frontend'))
+
+import yahrzeit_manager
+from yahrzeit_manager import YahrzeitManager
+
+
+class YahrzeitTestBase(unittest.TestCase):
+
+    def setUp(self):
+        self.db_fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        with patch.dict(os.environ, {'SENDGRID_API_KEY': ''}):
+            self.mgr = YahrzeitManager(self.db_path)
+
+    def tearDown(self):
+        self.mgr.close()
+        os.close(self.db_fd)
+        os.unlink(self.db_path)
+
+    def _subscribe(self, email='a@example.com', name='Sarah Cohen', date='2024-03-15', **extra):
+        data = {'deceased_name': name, 'date_of_death': date, 'email': email}
+        data.update(extra)
+        return self.mgr.subscribe(data)
+
+    def _row(self, reminder_id):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        row = conn.execute('SELECT * FROM yahrzeit_reminders WHERE id = ?', (reminder_id,)).fetchone()
+        conn.close()
+        return dict(row)
+
+    def _unsubscribe_token(self, reminder_id):
+        return self._row(reminder_id)['unsubscribe_token']
+
+
+class TestSubscribe(YahrzeitTestBase):
+
+    def test_subscribe_stores_hebrew_date(self):
+        result = self._subscribe(email=' A@Example.com ')
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['email'], 'a@example.com')
+        row = self._row(result['id'])
+        self.assertEqual(row['confirmed'], 0)
+        self.assertEqual((row['hebrew_month'], row['hebrew_day']), (8, 5))  # 5 Adar II 5784
+        self.assertEqual(row['hebrew_date_of_death'], result['hebrew_date'])
+
+    def test_rejects_bad_input(self):
+        self.assertEqual(self._subscribe(name='')['status'], 'error')
+        self.assertEqual(self._subscribe(email='nope')['status'], 'error')
+        self.assertEqual(self._subscribe(date='15/03/2024')['status'], 'error')
+
+    def test_subscribe_leaves_no_open_transaction(self):
+        self._subscribe()
+        self.assertEqual(self._subscribe()['status'], 'success')
+        conn = self.mgr._get_conn()
+        self.assertFalse(conn.in_transaction)
+
+        with patch.object(self.mgr, '_new_reminder_id', side_effect=RuntimeError('boom')):
+            self.assertEqual(self._subscribe(email='x@example.com')['status'], 'error')
+        self.assertFalse(conn.in_transaction)
+
+    def test_failed_commit_reported_and_rolled_back(self):
+        conn = self.mgr._get_conn()
+
+        class _CommitFails:
+            def __getattr__(self, name):
+                return getattr(conn, name)
+
+            def execute(self, sql, *args):
+                if sql == 'COMMIT':
+                    raise sqlite3.OperationalError('database is locked')
+                return conn.execute(sql, *args)
+
+        self.mgr._conn = _CommitFails()
+        self.assertEqual(self._subscribe()['status'], 'error')
+        self.assertFalse(conn.in_transaction)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM yahrzeit_reminders').fetchone()[0], 0)
+        self.mgr._conn = conn
+
+    def test_date_of_death_formats(self):
+        # Same inputs the strptime('%Y-%m-%d') check has always taken
+        result = self._subscribe(date='2024-3-5')
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(self._row(result['id'])['date_of_death'], '2024-3-5')
+        for bad in ('20240315', '2024-W11-5', '2024-02-30'):
+            self.assertEqual(self._subscribe(email='b@example.com', date=bad)['status'], 'error', bad)
+
+    def test_reminder_ids_are_time_ordered(self):
+        ids = [self._subscribe(email=f'u{i}@example.com')['id'] for i in range(3)]
+        for reminder_id in ids:
+            self.assertRegex(reminder_id, r'^[0-9]{13}[0-9a-f]{10}$')
+        self.assertEqual([i[:13] for i in ids], sorted(i[:13] for i in ids))
+
+    def test_tokens_are_distinct_and_url_safe(self):
+        row = self._row(self._subscribe()['id'])
+        tokens = (row['confirmation_token'], row['unsubscribe_token'])
+        self.assertNotEqual(*tokens)
+        for token in tokens:
+            self.assertRegex(token, r'^[A-Za-z0-9_-]{22}$')
+
+    def test_validate_email(self):
+        self.assertEqual(self.mgr._validate_email(' Someone@Example.COM '), 'someone@example.com')
+        for bad in (None, '', 'nope', 'a@b', 'a@b.', 'a b@example.com', 'a@@example.com', '@example.com'):
+            self.assertIsNone(self.mgr._validate_email(bad), bad)
+
+    def test_duplicate_of_active_reminder_rejected(self):
+        first = self._subscribe()
+        self.mgr.confirm(first['confirmation_token'])
+        self.assertEqual(self._subscribe()['status'], 'error')
+
+    def test_resubscribe_after_unsubscribe_reuses_row(self):
+        first = self._subscribe()
+        self.mgr.confirm(first['confirmation_token'])
+        self.mgr.unsubscribe(self._unsubscribe_token(first['id']))
+
+        again = self._subscribe()
+        self.assertEqual(again['status'], 'success')
+        self.assertEqual(again['id'], first['id'])
+        row = self._row(first['id'])
+        self.assertEqual(row['confirmed'], 0)
+        self.assertIsNone(row['unsubscribed_at'])
+        self.assertEqual(row['confirmation_token'], again['confirmation_token'])
+
+
+class TestConfirmUnsubscribe(YahrzeitTestBase):
+
+    def test_confirm_then_already_confirmed(self):
+        sub = self._subscribe()
+        result = self.mgr.confirm(sub['confirmation_token'])
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['hebrew_date'], sub['hebrew_date'])
+        row = self._row(sub['id'])
+        self.assertEqual(row['confirmed'], 1)
+        self.assertIsNone(row['confirmation_token'])
+        # Token is cleared on confirm, so a second click is an invalid link
+        self.assertEqual(self.mgr.confirm(sub['confirmation_token'])['status'], 'error')
+
+    def test_confirm_expired_token(self):
+        sub = self._subscribe()
+        old = (datetime.now() - timedelta(hours=73)).isoformat()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('UPDATE yahrzeit_reminders SET subscribed_at = ? WHERE id = ?', (old, sub['id']))
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.mgr.confirm(sub['confirmation_token'])['status'], 'error')
+        self.assertEqual(self._row(sub['id'])['confirmed'], 0)
+
+    def test_confirm_without_returning_support(self):
+        sub = self._subscribe()
+        with patch.object(yahrzeit_manager, '_HAS_RETURNING', False):
+            result = self.mgr.confirm(sub['confirmation_token'])
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['deceased_name'], 'Sarah Cohen')
+        self.assertEqual(self._row(sub['id'])['confirmed'], 1)
+
+    def test_unsubscribe_then_already_unsubscribed(self):
+        sub = self._subscribe()
+        token = self._unsubscribe_token(sub['id'])
+        self.assertEqual(self.mgr.unsubscribe(token)['status'], 'success')
+        self.assertEqual(self.mgr.unsubscribe(token)['status'], 'already_unsubscribed')
+        self.assertEqual(self.mgr.unsubscribe('bogus')['status'], 'error')
+
+
+class TestProcessorQueries(YahrzeitTestBase):
+
+    def test_active_reminders_and_sent_markers(self):
+        active = self._subscribe(email='active@example.com')
+        self.mgr.confirm(active['confirmation_token'])
+        self._subscribe(email='pending@example.com')
+        gone = self._subscribe(email='gone@example.com')
+        self.mgr.confirm(gone['confirmation_token'])
+        self.mgr.unsubscribe(self._unsubscribe_token(gone['id']))
+
+        reminders = self.mgr.get_active_reminders()
+        self.assertEqual([r['id'] for r in reminders], [active['id']])
+        self.assertEqual(reminders[0]['subscriber_email'], 'active@example.com')
+
+        self.assertEqual(list(self.mgr.iter_active_reminders()), reminders)
+
+        # A consumer paused mid-iteration doesn't hold the connection lock
+        paused = self.mgr.iter_active_reminders()
+        next(paused)
+        other = threading.Thread(target=self._subscribe, kwargs={'email': 'other@example.com'})
+        other.start()
+        other.join(5)
+        self.assertFalse(other.is_alive())
+        paused.close()
+        self.assertEqual(reminders[0]['date_of_death'], '2024-03-15')
+
+        self.mgr.update_reminder_timestamp(active['id'])
+        row = self._row(active['id'])
+        self.assertIsNotNone(row['last_reminder_sent'])
+        self.assertIsNone(row['last_reminder_hebrew_year'])
+
+        self.mgr.update_reminder_sent(active['id'], 5785)
+        self.assertEqual(self._row(active['id'])['last_reminder_hebrew_year'], 5785)
+
+    def test_bulk_update_reminder_sent(self):
+        ids = []
+        for i in range(3):
+            sub = self._subscribe(email=f'u{i}@example.com')
+            self.mgr.confirm(sub['confirmation_token'])
+            ids.append(sub['id'])
+        self.mgr.update_reminder_sent(ids[2], 5784)
+
+        self.mgr.bulk_update_reminder_sent([(ids[0], 5785), (ids[1], None), (ids[2], None)])
+
+        rows = [self._row(i) for i in ids]
+        self.assertTrue(all(r['last_reminder_sent'] for r in rows))
+        self.assertEqual([r['last_reminder_hebrew_year'] for r in rows], [5785, None, 5784])
+
+    def test_reminders_due_filters_date_and_year_in_sql(self):
+        ids = []
+        for i in range(4):
+            sub = self._subscribe(email=f'u{i}@example.com')
+            self.mgr.confirm(sub['confirmation_token'])
+            ids.append(sub['id'])
+        self.mgr.bulk_update_reminder_sent([(ids[1], 5785), (ids[2], 5784)])
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('UPDATE yahrzeit_reminders SET hebrew_month = NULL WHERE id = ?', (ids[3],))
+        conn.commit()
+        conn.close()
+
+        due = self.mgr.get_reminders_due({(8, 5): 5785, (1, 1): 5786})
+
+        # ids[1] already sent for 5785; ids[3] has no stored date so comes back unfiltered
+        self.assertEqual(sorted((r['id'], r['due_hebrew_year']) for r in due),
+                         sorted([(ids[0], 5785), (ids[2], 5785), (ids[3], None)]))
+        self.assertEqual([r['id'] for r in self.mgr.get_reminders_due({(1, 1): 5786})], [ids[3]])
+
+    def test_processor_records_day_of_send(self):
+        from hdate import HebrewDate
+        import yahrzeit_processor
+
+        sub = self._subscribe()
+        self.mgr.confirm(sub['confirmation_token'])
+        today = HebrewDate.from_gdate(datetime.now(yahrzeit_processor.TORONTO_TZ).date())
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('UPDATE yahrzeit_reminders SET hebrew_month = ?, hebrew_day = ? WHERE id = ?',
+                     (today.month.value, today.day, sub['id']))
+        conn.commit()
+        conn.close()
+
+        with patch.object(yahrzeit_processor, 'is_shabbat_pause', return_value=False), \
+                patch.dict(os.environ, {'SENDGRID_API_KEY': ''}):
+            yahrzeit_processor.process_yahrzeit_reminders(self.db_path)
+
+        row = self._row(sub['id'])
+        self.assertEqual(row['last_reminder_hebrew_year'], today.year)
+        self.assertIsNotNone(row['last_reminder_sent'])
+
+    def test_processor_skips_manager_when_no_active_reminders(self):
+        import yahrzeit_processor
+
+        self._subscribe()  # pending confirmation, so not active
+        self.assertFalse(yahrzeit_processor.has_active_reminders(self.db_path))
+        fd, empty_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.addCleanup(os.unlink, empty_path)
+        self.assertFalse(yahrzeit_processor.has_active_reminders(empty_path))
+
+        with patch.object(yahrzeit_processor, 'is_shabbat_pause', return_value=False), \
+                patch.object(yahrzeit_manager, 'YahrzeitManager') as manager:
+            yahrzeit_processor.process_yahrzeit_reminders(self.db_path)
+        manager.assert_not_called()
+
+        sub = self._subscribe(email='b@example.com')
+        self.mgr.confirm(sub['confirmation_token'])
+        self.assertTrue(yahrzeit_processor.has_active_reminders(self.db_path))
+
+    def test_shabbat_pause_uses_given_time(self):
+        import yahrzeit_processor
+        tz = yahrzeit_processor.TORONTO_TZ
+        self.assertTrue(yahrzeit_processor.is_shabbat_pause(tz.localize(datetime(2026, 10, 16, 19, 0))))
+        self.assertTrue(yahrzeit_processor.is_shabbat_pause(tz.localize(datetime(2026, 10, 17, 20, 59))))
+        self.assertFalse(yahrzeit_processor.is_shabbat_pause(tz.localize(datetime(2026, 10, 17, 21, 0))))
+        self.assertFalse(yahrzeit_processor.is_shabbat_pause(tz.localize(datetime(2026, 10, 15, 19, 0))))
+
+    def test_calendar_matches_per_date_lookup(self):
+        calendar = self.mgr.build_yahrzeit_calendar()
+        self.assertGreater(len(calendar), 350)
+        for month in range(1, 15):
+            for day in (1, 29, 30):
+                self.assertEqual(calendar.get((month, day)),
+                                 self.mgr.get_next_yahrzeit_gregorian(month, day))
+
+
+class TestMail(YahrzeitTestBase):
+
+    def test_confirmation_email_sent_off_thread(self):
+        sub = self._subscribe()
+        calls = []
+        caller = threading.current_thread()
+
+        def fake_send(data):
+            calls.append((data['confirmation_token'], threading.current_thread() is caller))
+
+        with patch.object(self.mgr, 'send_confirmation_email', side_effect=fake_send):
+            self.mgr.queue_confirmation_email(sub)
+            self.mgr.flush_mail()
+
+        self.assertEqual(calls, [(sub['confirmation_token'], False)])
+
+    def test_worker_survives_failed_send(self):
+        with patch.object(self.mgr, 'send_confirmation_email', side_effect=RuntimeError('boom')):
+            self.mgr.queue_confirmation_email({'email': 'a@example.com'})
+            self.mgr.flush_mail()
+        with patch.object(self.mgr, 'send_confirmation_email') as send:
+            self.mgr.queue_confirmation_email({'email': 'b@example.com'})
+            self.mgr.flush_mail()
+        send.assert_called_once_with({'email': 'b@example.com'})
+
+    def test_exit_hook_drains_queued_mail(self):
+        release = threading.Event()
+        sent = []
+
+        def slow_send(data):
+            release.wait(5)
+            sent.append(data['email'])
+
+        with patch.object(self.mgr, 'send_confirmation_email', side_effect=slow_send):
+            self.mgr.queue_confirmation_email({'email': 'a@example.com'})
+            self.assertFalse(self.mgr.flush_mail(timeout=0.05))
+            release.set()
+            yahrzeit_manager._close_managers()
+        self.assertEqual(sent, ['a@example.com'])
+
+    def test_sendgrid_client_built_once(self):
+        clients = []
+
+        class FakeClient:
+            def __init__(self, key):
+                clients.append(key)
+
+            def send(self, message):
+                return type('Resp', (), {'status_code': 202})()
+
+        self.mgr.sendgrid_api_key = 'test-key'
+        sub = self._subscribe()
+        reminder = dict(self._row(sub['id']))
+        with patch.object(yahrzeit_manager, 'SendGridAPIClient', FakeClient):
+            self.assertTrue(self.mgr.send_confirmation_email(sub))
+            self.assertTrue(self.mgr.send_yahrzeit_reminder(reminder, 'day_of'))
+            self.assertTrue(self.mgr.send_yahrzeit_reminder(reminder, 'week_ahead'))
+        self.assertEqual(clients, ['test-key'])
+
+    def test_batch_send_one_request_per_chunk(self):
+        requests = []
+
+        class FakeClient:
+            def __init__(self, key):
+                pass
+
+            def send(self, message):
+                requests.append(message.get())
+                return type('Resp', (), {'status_code': 202})()
+
+        self.mgr.sendgrid_api_key = 'test-key'
+        reminders = []
+        for i in range(5):
+            sub = self._subscribe(email=f'u{i}@example.com', name=f'Person {i}')
+            reminders.append(self._row(sub['id']))
+
+        with patch.object(yahrzeit_manager, 'SendGridAPIClient', FakeClient), \
+                patch.object(yahrzeit_manager, 'SENDGRID_BATCH_SIZE', 2):
+            sent = self.mgr.send_yahrzeit_batch(reminders, 'day_of')
+
+        self.assertEqual(sent, reminders)
+        self.assertEqual(len(requests), 3)
+        personalizations = sorted((p for r in requests for p in r['personalizations']),
+                                  key=lambda p: p['to'][0]['email'])
+        self.assertEqual([p['to'][0]['email'] for p in personalizations],
+                         [f'u{i}@example.com' for i in range(5)])
+        first = personalizations[0]
+        self.assertEqual(first['subject'], 'Today is the yahrzeit of Person 0')
+        self.assertEqual(first['substitutions']['-name_display-'], 'Person 0')
+        self.assertTrue(first['substitutions']['-unsubscribe_url-'].endswith(reminders[0]['unsubscribe_token']))
+
+    def test_reminder_values_escape_user_text(self):
+        reminder = {'deceased_name': 'Ruth "R" <Levi>', 'hebrew_name': 'Rut & Co',
+                    'hebrew_date_of_death': '5 Adar II 5784', 'obituary_id': 'a"b',
+                    'unsubscribe_token': 'tok'}
+        name_display, hebrew_date, memorial_link, _url = self.mgr._reminder_values(reminder)
+        self.assertEqual(name_display, 'Ruth &quot;R&quot; &lt;Levi&gt; (Rut &amp; Co)')
+        self.assertEqual(hebrew_date, '5 Adar II 5784')
+        self.assertIn('/memorial/a&quot;b"', memorial_link)
+
+
+class TestConnections(YahrzeitTestBase):
+
+    def test_connection_shared_across_threads(self):
+        conn = self.mgr._get_conn()
+        self.assertIs(self.mgr._get_conn(), conn)
+
+        # One thread per request, as under ThreadingHTTPServer
+        results = []
+        threads = [threading.Thread(target=lambda i=i: results.append(
+            self._subscribe(email=f'u{i}@example.com')['status'])) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, ['success'] * 20)
+        self.assertIs(self.mgr._get_conn(), conn)
+
+        self.mgr.close()
+        self.assertIsNot(self.mgr._get_conn(), conn)
+
+    def test_connection_closed_for_unlock(self):
+        conn = self.mgr._get_conn()
+        done = threading.Event()
+        with self.mgr.connection_closed():
+            with self.assertRaises(sqlite3.ProgrammingError):
+                conn.execute('SELECT 1')
+            t = threading.Thread(target=lambda: (self._subscribe(), done.set()))
+            t.start()
+            self.assertFalse(done.wait(0.2))  # held off until the block ends
+        t.join(5)
+        self.assertTrue(done.is_set())
+        self.assertIsNot(self.mgr._get_conn(), conn)
+
+    def test_pragmas_run_once_per_connection(self):
+        statements = []
+        self.mgr._get_conn().set_trace_callback(statements.append)
+        for i in range(3):
+            self._subscribe(email=f'u{i}@example.com')
+        self.mgr.close()
+        self.assertEqual([s for s in statements if s.startswith('PRAGMA')], ['PRAGMA optimize'])
+
+    def test_duplicate_check_uses_index(self):
+        for i in range(3):
+            self._subscribe(email=f'u{i}@example.com')
+        conn = sqlite3.connect(self.db_path)
+        plan = conn.execute('''
+            EXPLAIN QUERY PLAN
+            SELECT id, confirmed, unsubscribed_at FROM yahrzeit_reminders
+            WHERE subscriber_email = ? AND deceased_name = ? AND date_of_death = ?
+        ''', ('u1@example.com', 'Sarah Cohen', '2024-03-15')).fetchall()
+        conn.close()
+        self.assertIn('USING INDEX idx_yahr_dup', plan[0][3])
+
+    def test_active_scan_uses_covering_partial_index(self):
+        conn = self.mgr._get_conn()
+        plan = conn.execute(f'''
+            EXPLAIN QUERY PLAN
+            SELECT hebrew_month, hebrew_day, {yahrzeit_manager._ACTIVE_REMINDER_COLUMNS}
+            FROM yahrzeit_reminders WHERE confirmed = 1 AND unsubscribed_at IS NULL
+        ''').fetchall()
+        self.assertIn('USING COVERING INDEX idx_yahr_active_covering', plan[0][3])
+
+    def test_database_switched_to_wal(self):
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()